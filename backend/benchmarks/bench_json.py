@@ -0,0 +1,78 @@
+"""
+Response encoding: Flask's DefaultJSONProvider vs common.utils.json_provider.FastJSONProvider.
+
+No database needed; payloads are synthetic rows run through the same compiled
+row serializers the list endpoints use (a 100-row /hr/employees page and a
+200-row /hr/documents list, with meta_values JSON and some Arabic text).
+Run from backend folder:
+  (.venv) python -m benchmarks.bench_json --repeat 2000
+"""
+from __future__ import annotations
+import argparse, os, time
+from datetime import date, datetime
+from decimal import Decimal
+
+os.environ["DATABASE_URL"] = "sqlite://"  # before importing the app
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app import app  # noqa: E402
+from common.utils.json_provider import FastJSONProvider  # noqa: E402
+from modules.core.pagination import Page, page_to_dict  # noqa: E402
+from modules.core.serializers import row_serializer  # noqa: E402
+from modules.hr.schemas import EmployeeOut, EmployeeDocumentOut  # noqa: E402
+
+
+def employee_page(n: int) -> dict:
+    rows = [
+        (i, f"ARA{i}", f"First{i % 997}", f"Last{i}", f"emp{i}@example.com", "+971500000000", "Welder",
+         i % 4 + 1, True, Decimal("1234.50"), "Indian", date(1990, 1, 1 + i % 28), date(2020, 1, 1), None)
+        for i in range(n)
+    ]
+    items = row_serializer(EmployeeOut).many(rows)
+    return page_to_dict(Page(items=items, page=1, size=n, total=20_000), items)
+
+
+def document_list(n: int) -> list:
+    stamp = datetime(2024, 5, 1, 9, 30)
+    rows = [
+        (i, i % 500 + 1, i % 6 + 1, f"passport_{i}.pdf", f"uploads/employees/{i % 500 + 1}/passport_{i}.pdf",
+         date(2022, 1, 1), date(2027, 1, 1 + i % 28), True, True, False, None, stamp,
+         "جواز سفر ساري" if i % 3 == 0 else None,
+         {"number": f"P{i:07d}", "issuing_country": "IN", "place_of_issue": "Mumbai"}, stamp, stamp)
+        for i in range(n)
+    ]
+    return row_serializer(EmployeeDocumentOut).many(rows)
+
+
+def measure(label: str, provider, payload, repeat: int) -> float:
+    provider.response(payload)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        provider.response(payload)
+    per = (time.perf_counter() - t0) / repeat
+    print(f"{label:<28} {per * 1e6:10.1f} us/response")
+    return per
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    stdlib, fast = DefaultJSONProvider(app), FastJSONProvider(app)
+    utf8 = FastJSONProvider(app)
+    utf8.ensure_ascii = False  # raw UTF-8 instead of \uXXXX: not byte-identical, shown for reference
+    with app.app_context():
+        for name, payload in (("employees page (100)", employee_page(100)),
+                              ("documents list (200)", document_list(200))):
+            body = stdlib.response(payload).get_data()
+            assert body == fast.response(payload).get_data(), "output must be byte-identical"
+            print(f"{name}: {len(body):,} bytes")
+            slow = measure("DefaultJSONProvider", stdlib, payload, args.repeat)
+            quick = measure("FastJSONProvider", fast, payload, args.repeat)
+            print(f"{'speed-up':<28} {slow / quick:10.1f}x")
+            measure("FastJSONProvider, UTF-8", utf8, payload, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+List read path: ORM objects + marshmallow dump vs column rows + compiled
+row serializer (modules.core.serializers).
+
+Uses a throwaway in-memory SQLite database filled with synthetic employees.
+Run from backend folder:
+  (.venv) python -m benchmarks.bench_serializers --rows 20000 --page 100
+"""
+from __future__ import annotations
+import argparse, os, time
+from datetime import date
+from decimal import Decimal
+
+os.environ["DATABASE_URL"] = "sqlite://"  # before importing the app
+
+from app import app  # noqa: E402
+from extensions import db  # noqa: E402
+from modules.core.models import Branch  # noqa: E402
+from modules.core.serializers import row_serializer  # noqa: E402
+from modules.hr.models import Employee  # noqa: E402
+from modules.hr.schemas import EmployeeOut  # noqa: E402
+
+
+def seed(n: int) -> None:
+    db.create_all()
+    b = Branch(code="DXB", name="Dubai")
+    db.session.add(b)
+    db.session.flush()
+    db.session.execute(Employee.__table__.insert(), [
+        {"code": f"ARA{i}", "first_name": f"First{i % 997}", "last_name": f"Last{i}",
+         "email": f"emp{i}@example.com", "phone": "+971500000000", "position": "Welder",
+         "branch_id": b.id, "is_active": True, "salary_monthly": Decimal("1234.50"),
+         "nationality": "Indian", "dob": date(1990, 1, 1 + i % 28), "hire_date": date(2020, 1, 1)}
+        for i in range(n)
+    ])
+    db.session.commit()
+
+
+def orm_marshmallow(limit: int) -> list:
+    items = Employee.list_for_api(q=None, branch=None).limit(limit).all()
+    out = EmployeeOut(many=True).dump(items)
+    db.session.expunge_all()  # what request teardown does; keeps runs independent
+    return out
+
+
+def rows_compiled(limit: int) -> list:
+    ser = row_serializer(EmployeeOut)
+    query = Employee.list_for_api(q=None, branch=None, eager=False).with_entities(*ser.columns(Employee))
+    return ser.many(query.limit(limit))
+
+
+def measure(label: str, fn, limit: int, repeat: int) -> float:
+    fn(limit)  # warm-up (statement cache, serializer compile)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        n = len(fn(limit))
+    elapsed = time.perf_counter() - t0
+    rate = n * repeat / elapsed
+    print(f"{label:<28} {elapsed / repeat * 1e3:8.2f} ms/query   {rate:12,.0f} rows/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000, help="rows in the table")
+    parser.add_argument("--page", type=int, default=100, help="rows per query (a list page)")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    with app.app_context():
+        seed(args.rows)
+        assert orm_marshmallow(args.page) == rows_compiled(args.page)
+        for limit, repeat in ((args.page, args.repeat), (args.rows, 3)):
+            print(f"rows per query={limit}")
+            slow = measure("ORM + marshmallow", orm_marshmallow, limit, repeat)
+            fast = measure("Core rows + compiled", rows_compiled, limit, repeat)
+            print(f"{'speed-up':<28} {fast / slow:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
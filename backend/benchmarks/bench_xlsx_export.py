@@ -0,0 +1,104 @@
+"""
+XLSX export: the streamed writer (modules.hr.exports.iter_xlsx) vs openpyxl
+write-only and pandas to_excel (both build the whole file before a byte can go out).
+
+No database needed; rows are synthetic employee tuples shaped like the export.
+Each variant runs in a fresh process; memory is peak RSS (VmHWM) above the
+RSS after imports, so lxml/zlib/C allocations count too. "first byte" is
+when the client would start receiving data.
+Run from backend folder:
+  (.venv) python -m benchmarks.bench_xlsx_export --rows 100000
+"""
+from __future__ import annotations
+import argparse, multiprocessing, tempfile, time
+from datetime import date
+from decimal import Decimal
+
+from modules.hr.exports import EMPLOYEE_EXPORT_COLUMNS, iter_xlsx
+
+
+def fake_rows(n: int):
+    for i in range(n):
+        yield (i, f"ARA{i}", f"First{i % 997}", f"Last{i}", f"emp{i}@example.com", "+971500000000",
+               "Welder", i % 4 + 1, True, Decimal("1234.50"), "Indian", date(1990, 1, 1 + i % 28),
+               date(2020, 1, 1), None)
+
+
+def _rss_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def run_streamed(n: int) -> float:
+    """Seconds to the first chunk; the rest is consumed like a response would be."""
+    t0 = time.perf_counter()
+    first = None
+    with tempfile.TemporaryFile() as f:
+        for chunk in iter_xlsx(EMPLOYEE_EXPORT_COLUMNS, fake_rows(n), "employees"):
+            if first is None and chunk:
+                first = time.perf_counter() - t0
+            f.write(chunk)
+    return first
+
+
+def run_openpyxl(n: int) -> float:
+    from openpyxl import Workbook  # type: ignore
+    t0 = time.perf_counter()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="employees")
+    ws.append(list(EMPLOYEE_EXPORT_COLUMNS))
+    for row in fake_rows(n):
+        ws.append(list(row))
+    with tempfile.TemporaryFile() as f:
+        wb.save(f)
+    return time.perf_counter() - t0
+
+
+def run_pandas(n: int) -> float:
+    import pandas as pd  # type: ignore
+    t0 = time.perf_counter()
+    df = pd.DataFrame.from_records(list(fake_rows(n)), columns=EMPLOYEE_EXPORT_COLUMNS)
+    with tempfile.TemporaryFile() as f:
+        df.to_excel(f, index=False, engine="openpyxl")
+    return time.perf_counter() - t0
+
+
+RUNNERS = {"streamed (iter_xlsx)": run_streamed, "openpyxl write-only": run_openpyxl, "pandas to_excel": run_pandas}
+
+
+def _child(label: str, n: int, out) -> None:
+    if label == "pandas to_excel":
+        import pandas  # noqa: F401  (import cost is not export memory)
+    base = _rss_kb("VmRSS")
+    t0 = time.perf_counter()
+    first = RUNNERS[label](n)
+    out.put((first, time.perf_counter() - t0, (_rss_kb("VmHWM") - base) / 1024))
+
+
+def measure(label: str, n: int) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    p = ctx.Process(target=_child, args=(label, n, out))
+    p.start()
+    first, total, peak = out.get()
+    p.join()
+    print(f"{label:<22} first byte {first:7.2f} s   total {total:7.2f} s   peak RSS +{peak:7.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--skip-pandas", action="store_true")
+    args = parser.parse_args()
+    print(f"rows={args.rows}")
+    for label in RUNNERS:
+        if label == "pandas to_excel" and args.skip_pandas:
+            continue
+        measure(label, args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# backend/common/utils/compression.py
+"""
+Negotiated response compression (after_request hook).
+
+  - codec: br when the Brotli package is installed and the client takes it, else gzip
+  - only for COMPRESS_MIMETYPES, 200 responses, bodies >= COMPRESS_MIN_SIZE
+  - streamed (generator) bodies are compressed chunk by chunk: nothing is
+    buffered beyond the codec window, and a flush every COMPRESS_STREAM_FLUSH
+    input bytes keeps bytes moving on slow links
+  - skipped for responses that already have a Content-Encoding, file
+    passthroughs (send_file) and Cache-Control: no-transform
+
+Strong ETags are weakened on compressed responses (the bytes differ per
+encoding); If-None-Match checks must therefore use weak comparison.
+"""
+from __future__ import annotations
+import gzip, zlib
+from typing import Iterable, Iterator
+
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip only
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/csv",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "image/svg+xml",
+)
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._c = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+def _codecs() -> list[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _compressor(encoding: str, cfg) -> _Gzip | _Brotli:
+    if encoding == "br":
+        return _Brotli(cfg["COMPRESS_BR_QUALITY"])
+    return _Gzip(cfg["COMPRESS_LEVEL"])
+
+
+def _compress_body(encoding: str, data: bytes, cfg) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=cfg["COMPRESS_BR_QUALITY"])
+    return gzip.compress(data, compresslevel=cfg["COMPRESS_LEVEL"], mtime=0)
+
+
+def _compress_stream(chunks: Iterable, enc: _Gzip | _Brotli, flush_every: int) -> Iterator[bytes]:
+    pending = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        if not chunk:
+            continue
+        out = enc.compress(chunk)
+        pending += len(chunk)
+        if pending >= flush_every:
+            out += enc.flush()
+            pending = 0
+        if out:
+            yield out
+    yield enc.finish()
+
+
+class _CompressedBody:
+    """Streamed body wrapper; close() reaches the original iterable even if never iterated."""
+
+    def __init__(self, chunks: Iterable, enc: _Gzip | _Brotli, flush_every: int):
+        self._chunks = chunks
+        self._enc = enc
+        self._flush_every = flush_every
+
+    def __iter__(self) -> Iterator[bytes]:
+        return _compress_stream(self._chunks, self._enc, self._flush_every)
+
+    def close(self) -> None:
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()  # the generator's cleanup (temp files, DB cursors, app context)
+
+
+def _negotiate(response: Response, cfg) -> str | None:
+    if not cfg["COMPRESS_ENABLED"] or request.method == "HEAD":
+        return None
+    if response.status_code != 200 or response.direct_passthrough:
+        return None
+    if "Content-Encoding" in response.headers or response.mimetype not in cfg["COMPRESS_MIMETYPES"]:
+        return None
+    if "no-transform" in (response.headers.get("Cache-Control") or ""):
+        return None
+    return request.accept_encodings.best_match(_codecs())
+
+
+def compress_response(response: Response) -> Response:
+    cfg = current_app.config
+    if response.mimetype in cfg["COMPRESS_MIMETYPES"]:
+        response.vary.add("Accept-Encoding")
+    encoding = _negotiate(response, cfg)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _CompressedBody(response.response, _compressor(encoding, cfg), cfg["COMPRESS_STREAM_FLUSH"])
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < cfg["COMPRESS_MIN_SIZE"]:
+            return response
+        response.set_data(_compress_body(encoding, data, cfg))
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    app.config.setdefault("COMPRESS_ENABLED", True)
+    app.config.setdefault("COMPRESS_MIMETYPES", DEFAULT_MIMETYPES)
+    app.config.setdefault("COMPRESS_MIN_SIZE", 1024)  # bytes; smaller bodies gain nothing
+    app.config.setdefault("COMPRESS_LEVEL", 6)  # gzip
+    app.config.setdefault("COMPRESS_BR_QUALITY", 4)  # brotli: ~gzip-6 speed, smaller output
+    app.config.setdefault("COMPRESS_STREAM_FLUSH", 64 * 1024)
+    app.after_request(compress_response)
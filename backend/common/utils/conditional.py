@@ -0,0 +1,67 @@
+# backend/common/utils/conditional.py
+from __future__ import annotations
+import hashlib
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from flask import request, make_response, current_app
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import select, func
+
+from extensions import db
+
+
+def max_updated(model, *where) -> tuple:
+    """Cheap validator: (max(updated_at), count(*)) over `model` filtered by `where`."""
+    stmt = select(func.max(model.updated_at), func.count()).select_from(model)
+    if where:
+        stmt = stmt.where(*where)
+    return tuple(db.session.execute(stmt).one())
+
+
+def _etag_for(parts: tuple) -> str:
+    # the body also depends on the URL (query args) and on who asks
+    raw = repr((request.full_path, get_jwt_identity(), parts))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def conditional(validator: Callable[..., Optional[tuple]]):
+    """
+    Conditional GET for views whose body is derived from DB rows.
+
+    `validator(**view_kwargs)` returns a tuple whose first item is the
+    last-modified datetime (or None) and whose remaining items (row counts,
+    ids...) change whenever the body would; return None to skip (e.g. missing
+    row, so the view can 404). The view only runs when the client's copy is stale.
+    Put it below the auth decorators so it never answers unauthenticated requests.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            parts = validator(**kwargs)
+            if parts is None:
+                return fn(*args, **kwargs)
+            last_modified: Any = parts[0] if isinstance(parts[0], datetime) else None
+            if last_modified is not None:
+                last_modified = last_modified.replace(microsecond=0)
+            etag = _etag_for(parts)
+
+            if request.if_none_match:
+                fresh = request.if_none_match.contains_weak(etag)
+            else:
+                ims = request.if_modified_since
+                fresh = bool(ims and last_modified and last_modified <= ims.replace(tzinfo=None))
+            if fresh:
+                resp = current_app.response_class(status=304)
+            else:
+                resp = make_response(fn(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag, weak=True)
+            if last_modified is not None:
+                resp.last_modified = last_modified
+            resp.headers["Cache-Control"] = "private, no-cache"
+            return resp
+        return wrapper
+    return decorator
@@ -1,7 +1,8 @@
 # backend/common/utils/http.py
 from __future__ import annotations
+import hashlib, json
 from typing import Any, Dict, Tuple
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 
 def json_body() -> Dict[str, Any]:
     """Safe JSON parse that never raises."""
@@ -13,6 +14,26 @@ def ok(payload: Any = None, status: int = 200) -> Tuple[Any, int]:
 def error(message: str, status: int = 400) -> Tuple[Any, int]:
     return (jsonify({"message": message}), status)
 
+def json_etag(payload: Any) -> str:
+    """Strong validator for a JSON-able payload (stable across workers)."""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def ok_etag(payload: Any, etag: str, status: int = 200):
+    """
+    Like ok(), but answers 304 when the client's If-None-Match already has `etag`.
+    no-cache makes browsers revalidate every time instead of trusting a stale copy.
+    Weak comparison: compression sends the tag back as W/"...".
+    """
+    if request.if_none_match.contains_weak(etag):
+        resp = current_app.response_class(status=304)
+    else:
+        resp = jsonify({} if payload is None else payload)
+        resp.status_code = status
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
 def pag_params(default_per: int = 20, max_per: int = 100) -> tuple[int, int]:
     """Read ?page & ?per_page with sane bounds."""
     try:
@@ -0,0 +1,117 @@
+# backend/common/utils/json_provider.py
+"""
+JSON provider built on orjson (C encoder/decoder), byte-compatible with
+Flask's DefaultJSONProvider output (except non-finite floats, below):
+
+  - sorted keys, compact separators (indent=2 in debug), trailing newline
+  - date/datetime -> RFC 822 http_date, Decimal -> str, UUID -> str
+  - non-ASCII and DEL (0x7f) escaped as \\uXXXX (ensure_ascii), surrogate pairs included
+
+Anything orjson refuses (ints beyond 64 bits, non-str dict keys, lone
+surrogates, ...) falls back to the stdlib path, and so does output with a
+float orjson writes differently from repr(): exponent forms (1e16 vs
+1e+16, 1e-7 vs 1e-07) and 0.0000x (Python switches to 1e-05 there).
+One difference remains: NaN and +/-Infinity encode as null, where the
+stdlib writes the NaN/Infinity tokens (not JSON; JSON.parse rejects them).
+Use JSON_PROVIDER=default where those must round-trip.
+Parsing stays on the stdlib: orjson reads ints beyond 64 bits as floats.
+Select with app.config["JSON_PROVIDER"] = fast|default; without orjson
+installed the app keeps Flask's provider.
+"""
+from __future__ import annotations
+import codecs, re
+from typing import Any
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+def _escape_char(ch: str) -> str:
+    # same \uXXXX escapes json.dumps(ensure_ascii=True) writes, surrogate pairs above the BMP
+    n = ord(ch)
+    if n < 0x10000:
+        return "\\u%04x" % n
+    n -= 0x10000
+    return "\\u%04x\\u%04x" % (0xD800 | (n >> 10), 0xDC00 | (n & 0x3FF))
+
+
+_ESCAPES: dict[str, str] = {}
+
+
+def _json_escape(exc: UnicodeEncodeError) -> tuple[str, int]:
+    """codecs error handler: called once per run of non-ASCII characters."""
+    esc = _ESCAPES
+    out = []
+    for ch in exc.object[exc.start:exc.end]:
+        e = esc.get(ch)
+        if e is None:
+            e = esc[ch] = _escape_char(ch)
+        out.append(e)
+    return "".join(out), exc.end
+
+
+codecs.register_error("json_escape", _json_escape)
+
+# a number token in exponent form or below 1e-4: repr() and orjson disagree on how to write those
+# (may also match inside a string, which only costs a fallback)
+_REPR_MISMATCH = re.compile(rb"(?:^|[:,\[\s])-?(?:\d+(?:\.\d+)?e|0\.0000)")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the work on the hot paths."""
+
+    def _encode(self, obj: Any, indent: bool) -> bytes | None:
+        """orjson bytes, or None when the stdlib path must handle `obj`."""
+        # datetimes (http_date) and dataclasses (asdict, then key-sorted) go through `default`, like Flask
+        opts = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        if indent:
+            opts |= orjson.OPT_INDENT_2
+        try:
+            out = orjson.dumps(obj, default=self.default, option=opts)
+        except orjson.JSONEncodeError:
+            return None
+        if _REPR_MISMATCH.search(out):
+            return None
+        if self.ensure_ascii:
+            # non-ASCII and DEL only ever appear inside strings, so escaping the whole text is safe
+            if not out.isascii():
+                out = out.decode("utf-8").encode("ascii", "json_escape")
+            if b"\x7f" in out:  # the one ASCII character json.dumps escapes and orjson doesn't
+                out = out.replace(b"\x7f", b"\\u007f")
+        return out
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # only the two shapes response() uses map onto orjson; anything else is stdlib
+        if kwargs in ({"indent": 2}, {"separators": (",", ":")}):
+            out = self._encode(obj, "indent" in kwargs)
+            if out is not None:
+                return out.decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        out = self._encode(obj, indent)
+        if out is None:
+            return super().response(obj)
+        return self._app.response_class(out + b"\n", mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {"default": DefaultJSONProvider, "fast": FastJSONProvider}
+
+
+def init_json(app: Flask) -> None:
+    """Install the provider named by JSON_PROVIDER (default: fast when orjson is available)."""
+    name = (app.config.get("JSON_PROVIDER") or "fast").lower()
+    if name == "fast" and orjson is None:
+        name = "default"
+    cls = JSON_PROVIDERS.get(name, DefaultJSONProvider)
+    app.json_provider_class = cls
+    app.json = cls(app)
@@ -0,0 +1,507 @@
+# backend/common/utils/metrics.py
+"""
+Prometheus metrics: a small registry and GET /metrics (text format 0.0.4).
+
+  http_requests_total{blueprint,endpoint,method,status}
+  http_request_duration_seconds{blueprint,endpoint,method}    histogram
+  http_response_size_bytes{blueprint,endpoint}                histogram, bytes as sent
+  http_requests_in_flight{blueprint,endpoint}
+  db_statements_total, db_statement_seconds_total{blueprint,endpoint}   (sql_timing)
+  db_pool_*{engine}      checked out/size/overflow, checkouts/waits/wait seconds/timeouts
+  cache_hits_total, cache_misses_total{cache}
+
+`endpoint` is the URL rule ("/api/hr/employees/<int:emp_id>"), so label
+sets stay bounded; requests that match no rule are "unmatched". Duration
+runs to the end of the view and the after_request hooks; streamed bodies
+are neither timed to the last chunk nor sized.
+
+Multiple workers: with METRICS_DIR set, each process keeps its samples in
+its own memory-mapped file in that directory and /metrics sums the files
+of all processes, so whichever worker answers the scrape reports the whole
+server. Counters of workers that exited are folded into one archive file
+(totals never go backwards across worker restarts); gauges only count live
+processes. Files are named by pid plus boot id and process start time, so
+a file left by an earlier container or boot is recognised as dead even when
+its pid has been reused. That needs no wipe at startup, which would clear
+the files of another gunicorn master sharing the directory (the Procfile's
+`web` and `stream`). Without METRICS_DIR samples stay in process memory,
+which is only right for a single worker.
+
+Routes, traffic, pool state and cache names are not for the public: with
+METRICS_REQUIRE_TOKEN (on in prod) /metrics only exists when METRICS_TOKEN
+is set, and then answers only `Authorization: Bearer <METRICS_TOKEN>`.
+
+Pool and cache numbers are per-process totals kept elsewhere (db_pool,
+VersionedCache); each worker copies them into its file every
+METRICS_SYNC_SECONDS from a background thread, and the scraping worker
+once more before answering.
+"""
+from __future__ import annotations
+
+import bisect, fcntl, glob, hmac, json, math, mmap, os, re, struct, threading, time
+from collections import defaultdict
+from functools import lru_cache
+
+from flask import Flask, Response, current_app, g, request
+
+from common.utils.http import error
+from common.utils.sql_timing import request_sql_stats
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_USED = struct.Struct("q")    # file header: bytes in use, entries follow
+_KEYLEN = struct.Struct("i")
+_VALUE = struct.Struct("d")
+_INITIAL_FILE_SIZE = 64 * 1024
+_FILE = re.compile(r"(counter|gauge)_(\d+)(?:_([0-9a-f.]*))?\.db$")  # untagged: older layout, dead
+_ARCHIVE = "counter_archive.db"
+
+
+# ---------------------------------------------------------------- storage
+
+class _MmapFile:
+    """Append-only key -> float64 map in a file: one writing process, any number of readers."""
+
+    def __init__(self, path: str, fresh: bool = False):
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fresh:
+            os.ftruncate(self._fd, 0)
+        size = os.fstat(self._fd).st_size
+        if size == 0:
+            size = _INITIAL_FILE_SIZE
+            os.ftruncate(self._fd, size)
+        self._m = mmap.mmap(self._fd, size)
+        if _USED.unpack_from(self._m)[0] == 0:
+            _USED.pack_into(self._m, 0, _USED.size)
+        self._used = _USED.unpack_from(self._m)[0]
+        self._pos = {key: pos for key, pos, _ in _entries(self._m)}
+
+    def add(self, key: str, amount: float) -> None:
+        pos = self._pos.get(key) or self._append(key)
+        _VALUE.pack_into(self._m, pos, _VALUE.unpack_from(self._m, pos)[0] + amount)
+
+    def set(self, key: str, value: float) -> None:
+        _VALUE.pack_into(self._m, self._pos.get(key) or self._append(key), value)
+
+    def _append(self, key: str) -> int:
+        data = key.encode("utf-8")
+        pad = -(_KEYLEN.size + len(data)) % 8  # keep values 8-byte aligned
+        entry = _KEYLEN.pack(len(data)) + data + b" " * pad + _VALUE.pack(0.0)
+        end = self._used + len(entry)
+        if end > len(self._m):
+            size = max(len(self._m) * 2, end)
+            self._m.close()
+            os.ftruncate(self._fd, size)
+            self._m = mmap.mmap(self._fd, size)
+        self._m[self._used:end] = entry
+        _USED.pack_into(self._m, 0, end)  # publish only once the entry is complete
+        self._used = end
+        self._pos[key] = end - _VALUE.size
+        return self._pos[key]
+
+    def close(self) -> None:
+        self._m.close()
+        os.close(self._fd)
+
+
+def _entries(buf):
+    used = _USED.unpack_from(buf)[0]
+    pos = _USED.size
+    while pos < used:
+        (n,) = _KEYLEN.unpack_from(buf, pos)
+        key = bytes(buf[pos + _KEYLEN.size:pos + _KEYLEN.size + n]).decode("utf-8")
+        pos += _KEYLEN.size + n + (-(_KEYLEN.size + n) % 8)
+        yield key, pos, _VALUE.unpack_from(buf, pos)[0]
+        pos += _VALUE.size
+
+
+def _read(path: str) -> list[tuple[str, float]]:
+    with open(path, "rb") as f:
+        data = f.read()
+    return [(key, value) for key, _, value in _entries(data)] if len(data) >= _USED.size else []
+
+
+@lru_cache(maxsize=1)
+def _boot_id() -> str:
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            return f.read().strip().replace("-", "")[:12]
+    except OSError:
+        return "0"
+
+
+def _process_tag(pid: int) -> str | None:
+    """
+    "<boot id>.<start time in ticks after boot>" of process `pid`: neither a
+    reused pid nor a reboot repeats it. "" without /proc; None when there is
+    no such process.
+    """
+    if not os.path.isdir("/proc/self"):
+        return ""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # field 22 (starttime); the command name before it may contain spaces and parentheses
+    return f"{_boot_id()}.{int(stat.rsplit(b')', 1)[1].split()[19])}"
+
+
+def _alive(pid: int, tag: str) -> bool:
+    """Is the process that wrote a file named (pid, tag) still running?"""
+    now = _process_tag(pid)
+    if now is None:
+        return False
+    if now:
+        return now == tag
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class _MemoryStore:
+    def __init__(self):
+        self._values: dict[str, float] = defaultdict(float)
+
+    def add(self, kind: str, key: str, amount: float) -> None:
+        self._values[key] += amount
+
+    def set(self, kind: str, key: str, value: float) -> None:
+        self._values[key] = value
+
+    def collect(self) -> dict[str, float]:
+        return dict(self._values)
+
+
+class _FileStore:
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        pid = os.getpid()
+        me = f"{pid}_{_process_tag(pid)}"
+        self._files = {
+            "counter": _MmapFile(os.path.join(directory, f"counter_{me}.db"), fresh=True),
+            "gauge": _MmapFile(os.path.join(directory, f"gauge_{me}.db"), fresh=True),
+        }
+
+    def add(self, kind: str, key: str, amount: float) -> None:
+        self._files[kind].add(key, amount)
+
+    def set(self, kind: str, key: str, value: float) -> None:
+        self._files[kind].set(key, value)
+
+    def collect(self) -> dict[str, float]:
+        totals: dict[str, float] = defaultdict(float)
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # one folding reader at a time
+            self._fold_dead()
+            for path in glob.glob(os.path.join(self.directory, "*_*.db")):
+                for key, value in _read(path):
+                    totals[key] += value
+        return dict(totals)
+
+    def _fold_dead(self) -> None:
+        """Move counters of exited processes into the archive; drop their gauges."""
+        archive = None
+        for path in glob.glob(os.path.join(self.directory, "*_*.db")):
+            m = _FILE.search(path)
+            if m is None or (m.group(3) is not None and _alive(int(m.group(2)), m.group(3))):
+                continue
+            if m.group(1) == "counter":
+                archive = archive or _MmapFile(os.path.join(self.directory, _ARCHIVE))
+                for key, value in _read(path):
+                    archive.add(key, value)
+            os.remove(path)
+        if archive is not None:
+            archive.close()
+
+
+_store_lock = threading.Lock()
+_store = None
+_store_pid = None
+_directory: str | None = None
+
+
+def _current_store():
+    global _store, _store_pid
+    if _store_pid != os.getpid():  # first use, or a child forked after it
+        _store = _FileStore(_directory) if _directory else _MemoryStore()
+        _store_pid = os.getpid()
+    return _store
+
+
+# ---------------------------------------------------------------- registry
+
+REGISTRY: list[_Metric] = []
+
+
+@lru_cache(maxsize=8192)
+def _key(sample: str, labels: tuple) -> str:
+    return json.dumps([sample, labels])
+
+
+class _Metric:
+    kind = "counter"
+    storage = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        REGISTRY.append(self)
+
+    def _labels(self, labels: dict) -> tuple:
+        return tuple((n, str(labels[n])) for n in self.labelnames)
+
+    def _add(self, sample: str, labels: tuple, amount: float) -> None:
+        with _store_lock:
+            _current_store().add(self.storage, _key(sample, labels), amount)
+
+    def _render(self, samples: dict, out: list) -> None:
+        for labels, value in sorted(samples.get(self.name, ())):
+            out.append(f"{self.name}{_fmt_labels(labels)} {_fmt(value)}")
+
+
+class Counter(_Metric):
+    def inc(self, amount: float = 1, **labels) -> None:
+        self._add(self.name, self._labels(labels), amount)
+
+
+class Gauge(_Metric):
+    """Summed over live processes."""
+    kind = "gauge"
+    storage = "gauge"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        self._add(self.name, self._labels(labels), amount)
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self._add(self.name, self._labels(labels), -amount)
+
+    def set(self, value: float, **labels) -> None:
+        with _store_lock:
+            _current_store().set(self.storage, _key(self.name, self._labels(labels)), value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(float(b) for b in buckets)
+        self._le = tuple(_fmt(b) for b in self.buckets) + ("+Inf",)
+
+    def observe(self, value: float, **labels) -> None:
+        # buckets are stored per range and made cumulative when rendered: 3 writes per observation
+        labels = self._labels(labels)
+        le = self._le[bisect.bisect_left(self.buckets, value)]
+        with _store_lock:
+            store = _current_store()
+            store.add("counter", _key(self.name + "_bucket", labels + (("le", le),)), 1)
+            store.add("counter", _key(self.name + "_sum", labels), value)
+            store.add("counter", _key(self.name + "_count", labels), 1)
+
+    def _render(self, samples: dict, out: list) -> None:
+        buckets = {labels: value for labels, value in samples.get(self.name + "_bucket", ())}
+        sums = dict(samples.get(self.name + "_sum", ()))
+        for labels, count in sorted(samples.get(self.name + "_count", ())):
+            cumulative = 0.0
+            for le in self._le[:-1]:
+                cumulative += buckets.get(labels + (("le", le),), 0.0)
+                out.append(f"{self.name}_bucket{_fmt_labels(labels + (('le', le),))} {_fmt(cumulative)}")
+            out.append(f"{self.name}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {_fmt(count)}")
+            out.append(f"{self.name}_sum{_fmt_labels(labels)} {_fmt(sums.get(labels, 0.0))}")
+            out.append(f"{self.name}_count{_fmt_labels(labels)} {_fmt(count)}")
+
+
+def _fmt(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _fmt_labels(labels: tuple) -> str:
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in labels) + "}" if labels else ""
+
+
+def render() -> str:
+    """All registered metrics, summed over every process sharing METRICS_DIR."""
+    with _store_lock:
+        values = _current_store().collect()
+    samples: dict[str, list] = defaultdict(list)
+    for key, value in values.items():
+        sample, labels = json.loads(key)
+        samples[sample].append((tuple(tuple(pair) for pair in labels), value))
+    out: list[str] = []
+    for metric in REGISTRY:
+        out.append(f"# HELP {metric.name} {metric.documentation}")
+        out.append(f"# TYPE {metric.name} {metric.kind}")
+        metric._render(samples, out)
+    return "\n".join(out) + "\n"
+
+
+# ---------------------------------------------------------------- metrics
+
+_ROUTE = ("blueprint", "endpoint")
+REQUESTS = Counter("http_requests_total", "HTTP requests handled.", _ROUTE + ("method", "status"))
+LATENCY = Histogram("http_request_duration_seconds", "Time to produce a response.", _ROUTE + ("method",))
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Response body size as sent (after compression).",
+                          _ROUTE, buckets=SIZE_BUCKETS)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being handled.", _ROUTE)
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements run by requests.", _ROUTE)
+DB_TIME = Counter("db_statement_seconds_total", "Time requests spent in SQL statements.", _ROUTE)
+
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections in use.", ("engine",))
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size (without overflow).", ("engine",))
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Overflow connections open.", ("engine",))
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connection checkouts.", ("engine",))
+POOL_WAITS = Counter("db_pool_waits_total", "Checkouts that waited for a free connection.", ("engine",))
+POOL_WAIT_TIME = Counter("db_pool_wait_seconds_total", "Time checkouts waited for a free connection.", ("engine",))
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that timed out.", ("engine",))
+POOL_CONNECTS = Counter("db_pool_connects_total", "New database connections opened.", ("engine",))
+
+CACHE_HITS = Counter("cache_hits_total", "VersionedCache hits.", ("cache",))
+CACHE_MISSES = Counter("cache_misses_total", "VersionedCache misses.", ("cache",))
+
+
+# ---------------------------------------------------------------- syncing
+
+_synced: dict[tuple, float] = {}
+_sync_lock = threading.Lock()
+_sync_thread_pid = None
+
+
+def _mirror(counter: Counter, total: float, **labels) -> None:
+    """Advance `counter` to a per-process running total kept elsewhere."""
+    key = (counter.name, counter._labels(labels))
+    last = _synced.get(key)
+    if last is None or total > last:  # first sync writes 0 too: alerts want a series, not a gap
+        counter.inc(max(total - (last or 0.0), 0.0), **labels)
+    _synced[key] = total
+
+
+def _sync(app: Flask) -> None:
+    from db_pool import InstrumentedQueuePool
+    from db_routing import replica_engines
+    from extensions import db
+    from modules.core.cache import all_caches
+
+    with _sync_lock, app.app_context():
+        engines = [("primary", db.engine)] + [(f"replica{i}", e) for i, e in enumerate(replica_engines(app), 1)]
+        for name, engine in engines:
+            pool = engine.pool
+            if not isinstance(pool, InstrumentedQueuePool):
+                continue
+            POOL_CHECKED_OUT.set(pool.checkedout(), engine=name)
+            POOL_SIZE.set(pool.size(), engine=name)
+            POOL_OVERFLOW.set(max(pool.overflow(), 0), engine=name)
+            c = pool.counters()
+            _mirror(POOL_CHECKOUTS, c["checkouts"], engine=name)
+            _mirror(POOL_WAITS, c["waits"], engine=name)
+            _mirror(POOL_WAIT_TIME, c["wait_total"], engine=name)
+            _mirror(POOL_TIMEOUTS, c["timeouts"], engine=name)
+            _mirror(POOL_CONNECTS, c["connects"], engine=name)
+        caches: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+        for cache in all_caches():
+            caches[cache.name][0] += cache.hits
+            caches[cache.name][1] += cache.misses
+        for name, (hits, misses) in caches.items():
+            _mirror(CACHE_HITS, hits, cache=name)
+            _mirror(CACHE_MISSES, misses, cache=name)
+
+
+def _sync_forever(app: Flask, pid: int) -> None:
+    while os.getpid() == pid:
+        time.sleep(app.config["METRICS_SYNC_SECONDS"])
+        try:
+            _sync(app)
+        except Exception:  # e.g. the database is down; try again next round
+            app.logger.debug("metrics sync failed", exc_info=True)
+
+
+def _ensure_sync_thread(app: Flask) -> None:
+    # started lazily so each gunicorn worker (forked after import) gets its own
+    global _sync_thread_pid
+    pid = os.getpid()
+    if _sync_thread_pid == pid:
+        return
+    with _sync_lock:
+        if _sync_thread_pid != pid:
+            _sync_thread_pid = pid
+            threading.Thread(target=_sync_forever, args=(app, pid), name="metrics-sync", daemon=True).start()
+
+
+# ---------------------------------------------------------------- hooks
+
+def _route() -> dict:
+    rule = request.url_rule
+    return {"blueprint": request.blueprint or "", "endpoint": rule.rule if rule is not None else "unmatched"}
+
+
+def _start() -> None:
+    if not current_app.config["METRICS_ENABLED"]:
+        return
+    _ensure_sync_thread(current_app._get_current_object())
+    g._metrics_route = _route()
+    g._metrics_started = time.perf_counter()
+    IN_FLIGHT.inc(**g._metrics_route)
+
+
+def _finish(response: Response) -> Response:
+    route = g.get("_metrics_route")
+    if route is None:
+        return response
+    LATENCY.observe(time.perf_counter() - g._metrics_started, method=request.method, **route)
+    REQUESTS.inc(method=request.method, status=response.status_code, **route)
+    if not response.is_streamed and response.content_length is not None:
+        RESPONSE_SIZE.observe(response.content_length, **route)
+    stats = request_sql_stats()
+    if stats is not None and stats.count:
+        DB_STATEMENTS.inc(stats.count, **route)
+        DB_TIME.inc(stats.total, **route)
+    return response
+
+
+def _done(exc) -> None:
+    # teardown runs even when an after_request hook raised
+    route = g.pop("_metrics_route", None)
+    if route is not None:
+        IN_FLIGHT.dec(**route)
+
+
+def _metrics_view():
+    token = current_app.config["METRICS_TOKEN"]
+    if token:
+        given = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(given.encode(), token.encode()):
+            return error("Unauthorized", 401)
+    _sync(current_app._get_current_object())
+    return Response(render(), content_type=CONTENT_TYPE)
+
+
+def init_metrics(app: Flask) -> None:
+    """Request hooks and GET /metrics. Call before init_compression so response sizes are as sent."""
+    global _directory
+    app.config.setdefault("METRICS_ENABLED", True)
+    app.config.setdefault("METRICS_DIR", None)
+    app.config.setdefault("METRICS_TOKEN", None)  # bearer token required by /metrics when set
+    app.config.setdefault("METRICS_REQUIRE_TOKEN", False)  # no token -> no /metrics (404)
+    app.config.setdefault("METRICS_SYNC_SECONDS", 5)
+    _directory = app.config["METRICS_DIR"]
+    app.before_request(_start)
+    app.after_request(_finish)
+    app.teardown_request(_done)
+    if app.config["METRICS_REQUIRE_TOKEN"] and not app.config["METRICS_TOKEN"]:
+        app.logger.warning("METRICS_TOKEN is not set: /metrics is disabled")
+        return
+    app.add_url_rule("/metrics", "metrics", _metrics_view, methods=["GET"])
@@ -0,0 +1,131 @@
+# backend/common/utils/sql_timing.py
+"""
+Per-request SQL instrumentation (engine events + request hooks).
+
+For every request: number of statements, total DB time, the slowest
+statement, and statement shapes (SQL text with IN-lists collapsed) that
+ran SQL_N_PLUS_ONE_MIN times or more, the usual sign of an N+1 (one query
+per row of an earlier one). executemany counts once.
+
+  - Server-Timing: db;dur=<ms>;desc="<n> queries", app;dur=<ms>
+    (browser devtools show it next to the request)
+  - a warning log line when a request runs more than SQL_MAX_STATEMENTS,
+    spends more than SQL_SLOW_REQUEST_MS in the DB, has a statement slower
+    than SQL_SLOW_STATEMENT_MS or a suspected N+1
+
+Only request threads are measured (jobs and listeners run outside a
+request). Queries issued while a streamed body is generated happen after
+the headers are sent and are not counted.
+"""
+from __future__ import annotations
+import logging, re, time
+from collections import Counter
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+log = logging.getLogger(__name__)
+
+# "?, ?, ?" / "%(id_1_1)s, %(id_1_2)s" -> one placeholder, so IN-lists of any length share a shape
+_PARAM_LIST = re.compile(r"(\?|%s|%\([^)]+\)s)(\s*,\s*(\?|%s|%\([^)]+\)s))+")
+
+
+class SqlStats:
+    __slots__ = ("count", "total", "slowest", "slowest_sql", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_sql = None
+        self.shapes: Counter = Counter()
+
+    def add(self, statement: str, took: float) -> None:
+        self.count += 1
+        self.total += took
+        if took > self.slowest:
+            self.slowest, self.slowest_sql = took, statement
+        self.shapes[_PARAM_LIST.sub("?", statement)] += 1
+
+    def repeated(self, at_least: int) -> list[tuple[str, int]]:
+        return [(s, n) for s, n in self.shapes.most_common() if n >= at_least]
+
+
+def request_sql_stats() -> SqlStats | None:
+    """This request's stats so far (None outside a request or when disabled)."""
+    return g.get("_sql_stats") if has_request_context() else None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "_sql_stats" in g:
+        conn.info.setdefault("sql_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("sql_started")
+    if not started:
+        return
+    took = time.perf_counter() - started.pop()
+    stats = request_sql_stats()
+    if stats is not None:
+        stats.add(statement, took)
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("sql_started"):
+        conn.info["sql_started"].pop()
+
+
+def _start() -> None:
+    if current_app.config["SQL_TIMING_ENABLED"]:
+        g._sql_stats = SqlStats()
+        g._sql_request_started = time.perf_counter()
+
+
+def _clip(sql: str, keep: int = 300) -> str:
+    # the select list is the least telling part: keep the start and the FROM/WHERE end
+    sql = " ".join(sql.split())
+    return sql if len(sql) <= keep else f"{sql[:keep // 3]} ... {sql[-(keep - keep // 3):]}"
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _finish(response: Response) -> Response:
+    stats = request_sql_stats()
+    if stats is None:
+        return response
+    cfg = current_app.config
+    elapsed = time.perf_counter() - g._sql_request_started
+    if cfg["SQL_SERVER_TIMING"]:
+        timing = f'db;dur={_ms(stats.total)};desc="{stats.count} queries", app;dur={_ms(elapsed)}'
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+    suspects = stats.repeated(cfg["SQL_N_PLUS_ONE_MIN"])
+    if (stats.count > cfg["SQL_MAX_STATEMENTS"] or _ms(stats.total) > cfg["SQL_SLOW_REQUEST_MS"]
+            or _ms(stats.slowest) > cfg["SQL_SLOW_STATEMENT_MS"] or suspects):
+        log.warning(
+            "%s %s -> %s: %d statements, %.1f ms in DB of %.1f ms; slowest %.1f ms: %s%s",
+            request.method, request.path, response.status_code, stats.count, _ms(stats.total), _ms(elapsed),
+            _ms(stats.slowest), _clip(stats.slowest_sql or ""),
+            "".join(f"\n  suspected N+1 ({n}x): {_clip(shape)}" for shape, n in suspects[:5]),
+        )
+    return response
+
+
+def init_sql_timing(app: Flask) -> None:
+    app.config.setdefault("SQL_TIMING_ENABLED", True)
+    app.config.setdefault("SQL_SERVER_TIMING", True)
+    app.config.setdefault("SQL_MAX_STATEMENTS", 30)
+    app.config.setdefault("SQL_SLOW_REQUEST_MS", 500)
+    app.config.setdefault("SQL_SLOW_STATEMENT_MS", 200)
+    app.config.setdefault("SQL_N_PLUS_ONE_MIN", 5)  # same shape this many times in one request
+    app.before_request(_start)
+    app.after_request(_finish)
@@ -0,0 +1,96 @@
+# db_pool.py
+"""
+Connection pool instrumentation.
+
+InstrumentedQueuePool is SQLAlchemy's QueuePool plus counters on how long
+checkouts wait for a free connection (the number that says a pool is too
+small) and how often they time out. pool_stats() adds the live gauges.
+Everything is per process: with N gunicorn workers the database sees up to
+N x (pool_size + max_overflow) connections.
+"""
+from __future__ import annotations
+
+import os, threading, time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+WAIT_THRESHOLD = 0.001  # checkouts slower than this count as having waited
+
+
+class InstrumentedQueuePool(QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._stats = dict(checkouts=0, waits=0, wait_total=0.0, wait_max=0.0, timeouts=0,
+                           connects=0, connect_total=0.0)
+        self._connecting = threading.local()
+
+    def recreate(self):
+        # dispose() recreates the pool; keep the counters
+        pool = super().recreate()
+        pool._stats, pool._stats_lock = self._stats, self._stats_lock
+        return pool
+
+    def _create_connection(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            took = time.perf_counter() - t0
+            self._connecting.took = getattr(self._connecting, "took", 0.0) + took
+            with self._stats_lock:
+                self._stats["connects"] += 1
+                self._stats["connect_total"] += took
+
+    def _do_get(self):
+        if getattr(self._connecting, "active", False):  # QueuePool retries by recursing
+            return super()._do_get()
+        self._connecting.active, self._connecting.took = True, 0.0
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._stats["timeouts"] += 1
+            raise
+        finally:
+            # time spent opening a new connection isn't waiting for a free one
+            waited = time.perf_counter() - t0 - self._connecting.took
+            self._connecting.active = False
+            with self._stats_lock:
+                s = self._stats
+                s["checkouts"] += 1
+                if waited >= WAIT_THRESHOLD:
+                    s["waits"] += 1
+                    s["wait_total"] += waited
+                    s["wait_max"] = max(s["wait_max"], waited)
+
+    def counters(self) -> dict:
+        """Raw cumulative counters (seconds, not ms), e.g. for metrics."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def stats(self) -> dict:
+        s = self.counters()
+        return {
+            "checkouts": s["checkouts"],
+            "waits": s["waits"],
+            "wait_avg_ms": round(s["wait_total"] / s["waits"] * 1000, 2) if s["waits"] else 0.0,
+            "wait_max_ms": round(s["wait_max"] * 1000, 2),
+            "timeouts": s["timeouts"],
+            "connects": s["connects"],
+            "connect_avg_ms": round(s["connect_total"] / s["connects"] * 1000, 2) if s["connects"] else 0.0,
+        }
+
+
+def pool_stats(engine) -> dict:
+    """Gauges of this worker's pool, plus wait counters when the pool is instrumented."""
+    pool = engine.pool
+    data = {"pid": os.getpid(), "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        data.update(size=pool.size(), checked_out=pool.checkedout(), checked_in=pool.checkedin(),
+                    overflow=max(pool.overflow(), 0), max_overflow=pool._max_overflow, timeout=pool.timeout())
+    if isinstance(pool, InstrumentedQueuePool):
+        data.update(pool.stats())
+    return data
@@ -0,0 +1,141 @@
+# db_routing.py
+"""
+Read-replica routing for the Flask-SQLAlchemy session.
+
+With SQLALCHEMY_REPLICA_URIS set, a session sends reads to one replica
+(picked once per session, so a request sees one replica's snapshot) when
+  - the request is GET/HEAD/OPTIONS, or
+  - the code runs inside read_only() (decorator or context manager)
+and everything else to the primary:
+  - flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE, non-SELECT text()
+  - the rest of a request once it has written (its reads must see the write)
+  - code inside use_primary(), and anything outside a request by default
+  - VersionedCache fills (get_or_set): versions bump on primary commits, so
+    a replica read could cache pre-write rows as current for the whole TTL
+  - requests of a user who wrote within DB_READ_YOUR_WRITES_SECONDS, known
+    from a per-worker map by JWT identity and, across workers, a cookie
+
+Without replicas every call goes to the primary, exactly as before. A
+replica that is down fails the reads routed to it; remove it from the
+config to fall back.
+"""
+from __future__ import annotations
+
+import contextvars, random, threading, time
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from flask import Flask, current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+from settings import engine_options
+
+PIN_COOKIE = "db_primary_until"
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_mode: contextvars.ContextVar[str | None] = contextvars.ContextVar("db_route_mode", default=None)
+_recent_writers: dict = {}
+_writers_lock = threading.Lock()
+
+
+@contextmanager
+def read_only():
+    """Reads may go to a replica whatever the request method; writes still go to the primary. Also @read_only()."""
+    token = _mode.set("replica")
+    try:
+        yield
+    finally:
+        _mode.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Everything goes to the primary, e.g. a GET that must see the newest rows. Also @use_primary()."""
+    token = _mode.set("primary")
+    try:
+        yield
+    finally:
+        _mode.reset(token)
+
+
+def _is_write(clause) -> bool:
+    if clause is None:
+        return False
+    if isinstance(clause, sa.sql.dml.UpdateBase):
+        return True
+    if isinstance(clause, sa.sql.elements.TextClause):
+        return not clause.text.lstrip().lower().startswith(("select", "with"))
+    return getattr(clause, "_for_update_arg", None) is not None
+
+
+def _identity():
+    try:
+        from flask_jwt_extended import get_jwt_identity
+        return get_jwt_identity()
+    except Exception:  # no verified JWT in this request
+        return None
+
+
+def _pinned_by_recent_write() -> bool:
+    now = time.time()
+    try:
+        if float(request.cookies.get(PIN_COOKIE) or 0) > now:
+            return True
+    except ValueError:
+        pass
+    who = _identity()
+    return who is not None and _recent_writers.get(who, 0) > now
+
+
+def _replica_allowed() -> bool:
+    mode = _mode.get()
+    if mode is not None:
+        return mode == "replica" and not (has_request_context() and g.get("_db_wrote"))
+    if not has_request_context() or request.method not in READ_METHODS or g.get("_db_wrote"):
+        return False
+    if "_db_pinned" not in g:
+        g._db_pinned = _pinned_by_recent_write()
+    return not g._db_pinned
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replicas = current_app.extensions.get("db_replicas") if bind is None else None
+        if replicas:
+            if self._flushing or _is_write(clause):
+                if has_request_context():
+                    g._db_wrote = True
+            elif _replica_allowed():
+                if "replica" not in self.info:
+                    self.info["replica"] = random.choice(replicas)
+                return self.info["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _remember_write(response):
+    if not g.get("_db_wrote"):
+        return response
+    window = current_app.config.get("DB_READ_YOUR_WRITES_SECONDS", 5)
+    if window > 0:
+        until = time.time() + window
+        who = _identity()
+        if who is not None:
+            with _writers_lock:
+                _recent_writers[who] = until
+                if len(_recent_writers) > 10_000:  # drop expired entries now and then
+                    now = time.time()
+                    for k in [k for k, v in _recent_writers.items() if v <= now]:
+                        del _recent_writers[k]
+        response.set_cookie(PIN_COOKIE, f"{until:.0f}", max_age=window, httponly=True, samesite="Lax")
+    return response
+
+
+def init_replicas(app: Flask) -> None:
+    """Create the replica engines (same pool options as the primary) and the write tracking hook."""
+    uris = app.config.get("SQLALCHEMY_REPLICA_URIS") or []
+    app.extensions["db_replicas"] = [sa.create_engine(u, **engine_options(u)) for u in uris]
+    app.after_request(_remember_write)
+
+
+def replica_engines(app: Flask) -> list:
+    return app.extensions.get("db_replicas") or []
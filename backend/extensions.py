@@ -4,8 +4,9 @@ from flask_jwt_extended import JWTManager
 from flask_babel import Babel
 from flask_cors import CORS
 from flask import jsonify
+from db_routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})  # read replicas: db_routing
 migrate = Migrate()
 jwt = JWTManager()
 babel = Babel()
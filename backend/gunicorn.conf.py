@@ -0,0 +1,15 @@
+# backend/gunicorn.conf.py
+"""
+Gunicorn settings for the Procfile's processes (gunicorn reads
+./gunicorn.conf.py from the working directory; command-line flags win).
+
+The `stream` process runs gevent workers for the notification SSE route.
+psycopg2 gets gevent wait callbacks there, so its queries yield to the other
+streams instead of blocking the whole worker.
+"""
+
+
+def post_fork(server, worker):
+    if "gevent" in server.cfg.worker_class_str:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
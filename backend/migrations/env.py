@@ -97,6 +97,14 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # the app's statement timeout (settings.engine_options) would cut long
+        # index builds and backfills short; migrations run without one
+        dialect = connection.dialect.name
+        if dialect == "postgresql":
+            connection.exec_driver_sql("SET statement_timeout = 0")
+        elif dialect in ("mysql", "mariadb"):
+            connection.exec_driver_sql("SET SESSION max_execution_time = 0")
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -0,0 +1,43 @@
+"""trigram search indexes
+
+Revision ID: a3c9e1f4b2d7
+Revises: 067db5716538
+Create Date: 2026-10-16 09:12:40.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c9e1f4b2d7'
+down_revision = '067db5716538'
+branch_labels = None
+depends_on = None
+
+# GIN trigram indexes on lower(col) so `lower(col) LIKE '%q%'` (modules.core.search)
+# becomes an index scan. Postgres only; other dialects use the in-process index.
+TRGM_INDEXES = [
+    ('ix_employees_code_trgm', 'employees', 'code'),
+    ('ix_employees_first_name_trgm', 'employees', 'first_name'),
+    ('ix_employees_last_name_trgm', 'employees', 'last_name'),
+    ('ix_employees_email_trgm', 'employees', 'email'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_users_first_name_trgm', 'users', 'first_name'),
+    ('ix_users_last_name_trgm', 'users', 'last_name'),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRGM_INDEXES:
+        op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (lower({column}) gin_trgm_ops)')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, _table, _column in TRGM_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
@@ -0,0 +1,42 @@
+"""notifications NOTIFY trigger (Postgres only)
+
+Revision ID: d1a7c3e5b820
+Revises: c4f8a2d6e913
+Create Date: 2026-10-16 23:05:37.918254
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1a7c3e5b820'
+down_revision = 'c4f8a2d6e913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # wakes the per-worker SSE listener (modules.notifications.stream); one NOTIFY per statement,
+    # so bulk INSERT ... SELECT of reminders costs a single notification
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notifications_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('notifications', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER notifications_notify
+        AFTER INSERT ON notifications
+        FOR EACH STATEMENT EXECUTE PROCEDURE notifications_notify()
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS notifications_notify ON notifications")
+    op.execute("DROP FUNCTION IF EXISTS notifications_notify()")
@@ -0,0 +1,132 @@
+"""issue payloads in content-addressed issue_blobs
+
+Revision ID: f2c8e6a4d179
+Revises: e5b9d2f7a143
+Create Date: 2026-10-17 11:47:02.615930
+
+"""
+import hashlib, zlib
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c8e6a4d179'
+down_revision = 'e5b9d2f7a143'
+branch_labels = None
+depends_on = None
+
+BATCH = 500
+KINDS = ('request', 'response', 'headers')
+
+issues = sa.table('issues', sa.column('id', sa.Integer),
+                  *[sa.column(f'{k}_blob', sa.LargeBinary) for k in KINDS],
+                  *[sa.column(f'{k}_hash', sa.String) for k in KINDS])
+issue_blobs = sa.table('issue_blobs', sa.column('hash', sa.String), sa.column('data', sa.LargeBinary),
+                       sa.column('created_at', sa.DateTime))
+
+
+def _hash(blob):
+    # same address as modules.admin.models.blob_hash: sha256 of the uncompressed JSON text
+    try:
+        return hashlib.sha256(zlib.decompress(blob)).hexdigest()
+    except zlib.error:
+        return hashlib.sha256(blob).hexdigest()
+
+
+def _move_to_blobs(bind):
+    last_id = 0
+    now = datetime.utcnow()
+    while True:
+        rows = bind.execute(
+            sa.select(issues.c.id, *[issues.c[f'{k}_blob'] for k in KINDS])
+            .where(issues.c.id > last_id).order_by(issues.c.id).limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        blobs, updates = {}, []
+        for r in rows:
+            refs = {}
+            for k in KINDS:
+                blob = r._mapping[f'{k}_blob']
+                if blob:
+                    h = _hash(blob)
+                    blobs.setdefault(h, blob)
+                    refs[f'{k}_hash'] = h
+            if refs:
+                updates.append((r.id, refs))
+        if blobs:
+            have = set(bind.execute(sa.select(issue_blobs.c.hash).where(issue_blobs.c.hash.in_(list(blobs)))).scalars())
+            new = [{'hash': h, 'data': d, 'created_at': now} for h, d in blobs.items() if h not in have]
+            if new:
+                bind.execute(issue_blobs.insert(), new)
+        for issue_id, refs in updates:
+            bind.execute(issues.update().where(issues.c.id == issue_id).values(**refs))
+
+
+def _move_back(bind):
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(issues.c.id, *[issues.c[f'{k}_hash'] for k in KINDS])
+            .where(issues.c.id > last_id).order_by(issues.c.id).limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        hashes = {r._mapping[f'{k}_hash'] for r in rows for k in KINDS} - {None}
+        data = dict(bind.execute(sa.select(issue_blobs.c.hash, issue_blobs.c.data)
+                                 .where(issue_blobs.c.hash.in_(list(hashes)))).all()) if hashes else {}
+        for r in rows:
+            values = {f'{k}_blob': data.get(r._mapping[f'{k}_hash']) for k in KINDS}
+            if any(values.values()):
+                bind.execute(issues.update().where(issues.c.id == r.id).values(**values))
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('issue_blobs',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    with op.batch_alter_table('issues', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('request_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('response_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('headers_hash', sa.String(length=64), nullable=True))
+        batch_op.create_foreign_key('fk_issues_request_hash_issue_blobs', 'issue_blobs', ['request_hash'], ['hash'])
+        batch_op.create_foreign_key('fk_issues_response_hash_issue_blobs', 'issue_blobs', ['response_hash'], ['hash'])
+        batch_op.create_foreign_key('fk_issues_headers_hash_issue_blobs', 'issue_blobs', ['headers_hash'], ['hash'])
+    # ### end Alembic commands ###
+
+    _move_to_blobs(op.get_bind())
+
+    with op.batch_alter_table('issues', schema=None) as batch_op:
+        batch_op.drop_column('headers_blob')
+        batch_op.drop_column('response_blob')
+        batch_op.drop_column('request_blob')
+
+
+def downgrade():
+    with op.batch_alter_table('issues', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('request_blob', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('response_blob', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('headers_blob', sa.LargeBinary(), nullable=True))
+
+    _move_back(op.get_bind())
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('issues', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_issues_headers_hash_issue_blobs', type_='foreignkey')
+        batch_op.drop_constraint('fk_issues_response_hash_issue_blobs', type_='foreignkey')
+        batch_op.drop_constraint('fk_issues_request_hash_issue_blobs', type_='foreignkey')
+        batch_op.drop_column('headers_hash')
+        batch_op.drop_column('response_hash')
+        batch_op.drop_column('request_hash')
+
+    op.drop_table('issue_blobs')
+    # ### end Alembic commands ###
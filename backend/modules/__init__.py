@@ -3,6 +3,7 @@ from modules.auth.routes import bp as auth_bp
 from modules.users.routes import bp as users_bp
 from modules.hr.routes import bp as hr_bp
 from modules.admin.routes import bp as admin_bp
+from modules.notifications.routes import bp as notifications_bp
 from modules.users.models import Role, Permission, User
 from extensions import db
 from werkzeug.security import generate_password_hash
@@ -14,6 +15,7 @@ def register_all_blueprints(app: Flask, api_prefix: str = "/api"):
     app.register_blueprint(users_bp, url_prefix=f"{api_prefix}/users")
     app.register_blueprint(hr_bp,    url_prefix=f"{api_prefix}/hr")
     app.register_blueprint(admin_bp,    url_prefix=f"{api_prefix}/admin")
+    app.register_blueprint(notifications_bp, url_prefix=f"{api_prefix}/notifications")
 
 def seed_admin_if_empty():
     if not Role.query.filter_by(code="admin").first():
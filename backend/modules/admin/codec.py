@@ -0,0 +1,149 @@
+# backend/modules/admin/codec.py
+"""
+Blob codecs for issue payloads (issue_blobs.data).
+
+Stored format: one header byte naming the codec, then its body.
+  (none)  legacy: a bare zlib stream (always starts with 0x?8, so never 0x01/0x02)
+  0x01    zlib
+  0x02    raw deflate with a preset dictionary; the body starts with the
+          dictionary id (4 bytes, big-endian), see issue_blob_dicts
+
+Error payloads repeat the same headers and error envelopes, which per-row
+zlib has to learn again in every blob; a dictionary trained on a sample of
+stored payloads (train_dictionary) gives deflate those strings up front.
+Dictionaries are immutable once stored: blobs name the one they were
+written with, so training a new one never invalidates old blobs.
+"""
+from __future__ import annotations
+
+import heapq, struct, zlib
+from typing import Callable, Iterable
+
+LEVEL = 6
+MAX_DICT_SIZE = 32 * 1024   # deflate's window: anything further back is unreachable
+DMER = 8                    # substring length the trainer counts
+DMER_SAMPLE = 8             # ...of which it keeps about one in this many (by hash)
+MAX_SAMPLE_BYTES = 64 * MAX_DICT_SIZE  # 2 MiB of samples is plenty for a 32 KiB dictionary
+
+_MIX = 0x9E3779B97F4A7C15   # odd, so x * _MIX mod 2**64 is a bijection
+_MASK64 = (1 << 64) - 1
+_KEEP_BELOW = 256 // DMER_SAMPLE  # top hash byte below this -> kept
+
+
+class ZlibCodec:
+    tag = 0x01
+
+    def encode(self, raw: bytes) -> bytes:
+        return bytes((self.tag,)) + zlib.compress(raw, LEVEL)
+
+    @staticmethod
+    def decode(body: bytes, dictionaries: Callable[[int], bytes]) -> bytes:
+        return zlib.decompress(body)
+
+
+class DictCodec:
+    tag = 0x02
+
+    def __init__(self, dict_id: int, zdict: bytes):
+        self.dict_id = dict_id
+        self.zdict = zdict
+        self._header = bytes((self.tag,)) + struct.pack(">I", dict_id)
+        # loading a zdict hashes all of it; copying a primed compressor is ~4x cheaper per blob
+        self._primed = zlib.compressobj(LEVEL, zlib.DEFLATED, -15, zdict=zdict)
+
+    def encode(self, raw: bytes) -> bytes:
+        c = self._primed.copy()
+        return self._header + c.compress(raw) + c.flush()
+
+    @staticmethod
+    def decode(body: bytes, dictionaries: Callable[[int], bytes]) -> bytes:
+        (dict_id,) = struct.unpack_from(">I", body)
+        d = zlib.decompressobj(-15, zdict=dictionaries(dict_id))
+        return d.decompress(body[4:]) + d.flush()
+
+
+_DECODERS = {c.tag: c.decode for c in (ZlibCodec, DictCodec)}
+
+
+def decode(blob: bytes, dictionaries: Callable[[int], bytes]) -> bytes:
+    """Raw payload bytes of a stored blob, any format. `dictionaries(id)` returns a zdict."""
+    decoder = _DECODERS.get(blob[0])
+    if decoder is None:
+        return zlib.decompress(blob)  # legacy
+    return decoder(blob[1:], dictionaries)
+
+
+def _dmers(sample: bytes) -> set[int]:
+    """
+    Hashes of the sample's DMER-byte substrings that fall in the 1/DMER_SAMPLE
+    kept by hash value. Which ones are kept depends only on their content, so
+    a substring shared by two samples is kept (or dropped) in both, at any offset.
+    """
+    found = set()
+    for i in range(len(sample) - DMER + 1):
+        h = (int.from_bytes(sample[i:i + DMER], "little") * _MIX) & _MASK64  # a bijection: no collisions
+        if h >> 56 < _KEEP_BELOW:
+            found.add(h)
+    return found
+
+
+def train_dictionary(samples: Iterable[bytes], size: int = MAX_DICT_SIZE,
+                     max_sample_bytes: int = MAX_SAMPLE_BYTES) -> bytes:
+    """
+    A zdict from sample payloads, newest first (a simplified COVER, as in zstd).
+
+    Samples are taken in order until max_sample_bytes. Whole samples are
+    picked greedily by how many not-yet-covered DMER-byte substrings shared
+    with other samples they contain (a content-defined 1/DMER_SAMPLE of
+    them, see _dmers), then the rest of `size` is filled with further
+    samples in the given order for variety. The most valuable samples go
+    last: deflate reaches the end of the dictionary with the shortest distances.
+    """
+    kept: dict[bytes, None] = {}
+    total = 0
+    for s in samples:
+        if s in kept or not DMER <= len(s) <= size:
+            continue
+        if total + len(s) > max_sample_bytes:
+            break
+        kept[s] = None
+        total += len(s)
+    samples = list(kept)
+    grams = [_dmers(s) for s in samples]
+    where: dict[int, list[int]] = {}
+    for i, g in enumerate(grams):
+        for m in g:
+            where.setdefault(m, []).append(i)
+    # gain[i]: sum over i's still-uncovered shared d-mers of how many samples share them;
+    # picking a sample covers its d-mers and lowers the others' gains in place
+    gain = [sum(len(where[m]) for m in g if len(where[m]) > 1) for g in grams]
+
+    heap = [(-g, i) for i, g in enumerate(gain)]
+    heapq.heapify(heap)
+    picked, used = [], 0
+    while heap:
+        neg, i = heapq.heappop(heap)
+        if -neg != gain[i]:  # stale: gains only shrink, the current one is queued too
+            continue
+        if gain[i] <= 0:
+            break
+        if used + len(samples[i]) > size:
+            continue
+        picked.append(i)
+        used += len(samples[i])
+        touched = set()
+        for m in grams[i]:
+            holders = where.pop(m, ())
+            if len(holders) > 1:
+                for j in holders:
+                    gain[j] -= len(holders)
+                touched.update(holders)
+        touched.discard(i)
+        for j in touched:
+            heapq.heappush(heap, (-gain[j], j))
+    taken = set(picked)
+    for i in range(len(samples)):
+        if i not in taken and used + len(samples[i]) <= size:
+            picked.append(i)
+            used += len(samples[i])
+    return b"".join(samples[i] for i in reversed(picked))
@@ -0,0 +1,140 @@
+# backend/modules/admin/grouping.py
+"""
+Fingerprint grouping for issues.
+
+A report's fingerprint is sha1(method, URL template, HTTP status, message):
+  URL template  path only (no scheme/host/query), numeric segments -> :id,
+                UUIDs -> :uuid, long hex tokens -> :hash
+  message       response.message / error / detail / msg (or a string body),
+                with numbers -> N and whitespace collapsed
+
+record() upserts one issue_groups row per fingerprint (occurrences += n,
+last_seen = max, first_seen kept) and the per-day counters in
+issue_group_days, inside the caller's transaction. Fingerprints are written
+in sorted order so concurrent batches lock rows in the same order.
+"""
+from __future__ import annotations
+
+import hashlib, re
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import sqlalchemy as sa
+
+from extensions import db
+from .models import Issue, IssueBlob, IssueGroup, IssueGroupDay, _from_blob
+
+_UUID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+_HEX = re.compile(r"^[0-9a-f]{16,}$", re.I)
+_NUM = re.compile(r"\d+")
+_SPACE = re.compile(r"\s+")
+_MESSAGE_KEYS = ("message", "error", "detail", "msg")
+
+
+def url_template(url: str | None) -> str:
+    path = urlsplit(url or "").path or "/"
+    segments = []
+    for seg in path.split("/"):
+        if seg.isdigit():
+            seg = ":id"
+        elif _UUID.match(seg):
+            seg = ":uuid"
+        elif _HEX.match(seg):
+            seg = ":hash"
+        segments.append(seg)
+    return "/".join(segments)[:512]
+
+
+def message_of(response) -> str:
+    msg = response
+    if isinstance(response, dict):
+        msg = next((response[k] for k in _MESSAGE_KEYS if isinstance(response.get(k), str)), "")
+    if not isinstance(msg, str):
+        return ""
+    return _SPACE.sub(" ", _NUM.sub("N", msg)).strip()[:255]
+
+
+def group_key(method: str | None, url: str | None, http_status: int | None, response) -> dict:
+    """issue_groups columns (fingerprint included) for one report."""
+    attrs = dict(
+        method=(method or "").upper()[:10] or None,
+        url_template=url_template(url),
+        http_status=http_status,
+        message=message_of(response),
+    )
+    raw = "\x1f".join(str(attrs[k] or "") for k in ("method", "url_template", "http_status", "message"))
+    attrs["fingerprint"] = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return attrs
+
+
+def _upsert(table, rows: list[dict], keys: list[str], merge):
+    name = db.engine.dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(table).values(rows)
+    if name in ("mysql", "mariadb"):
+        return stmt.on_duplicate_key_update(merge(stmt.inserted))
+    return stmt.on_conflict_do_update(index_elements=[table.c[k] for k in keys], set_=merge(stmt.excluded))
+
+
+def record(reports: list[tuple[dict, datetime]]) -> dict[str, int]:
+    """
+    Count [(group_key(...), seen_at)] into the group and day counters.
+    Returns {fingerprint: group id}; the caller commits.
+    """
+    if not reports:
+        return {}
+    G, D = IssueGroup.__table__, IssueGroupDay.__table__
+    groups: dict[str, dict] = {}
+    days: Counter = Counter()
+    for attrs, seen in reports:
+        fp = attrs["fingerprint"]
+        g = groups.get(fp)
+        if g is None:
+            groups[fp] = {**attrs, "first_seen": seen, "last_seen": seen, "occurrences": 1}
+        else:
+            g["first_seen"] = min(g["first_seen"], seen)
+            g["last_seen"] = max(g["last_seen"], seen)
+            g["occurrences"] += 1
+        days[(fp, seen.date())] += 1
+
+    db.session.execute(_upsert(G, [groups[fp] for fp in sorted(groups)], ["fingerprint"], lambda new: {
+        "occurrences": G.c.occurrences + new.occurrences,
+        "last_seen": sa.case((new.last_seen > G.c.last_seen, new.last_seen), else_=G.c.last_seen),
+        "first_seen": sa.case((new.first_seen < G.c.first_seen, new.first_seen), else_=G.c.first_seen),
+    }))
+    ids = dict(db.session.execute(sa.select(G.c.fingerprint, G.c.id).where(G.c.fingerprint.in_(list(groups)))).all())
+
+    day_rows = [{"group_id": ids[fp], "day": day, "count": n} for (fp, day), n in sorted(days.items())]
+    db.session.execute(_upsert(D, day_rows, ["group_id", "day"], lambda new: {"count": D.c.count + new.count}))
+    return ids
+
+
+def group_existing(batch_size: int = 1_000) -> int:
+    """Group issues stored before grouping existed (group_id IS NULL). Returns how many."""
+    T, B = Issue.__table__, IssueBlob.__table__
+    done = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            sa.select(T.c.id, T.c.method, T.c.url, T.c.http_status, B.c.data.label("response"), T.c.created_at)
+            .select_from(T.outerjoin(B, B.c.hash == T.c.response_hash))
+            .where(T.c.group_id.is_(None), T.c.id > last_id).order_by(T.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return done
+        last_id = rows[-1].id
+        keys = [group_key(r.method, r.url, r.http_status, _from_blob(r.response)) for r in rows]
+        ids = record([(k, r.created_at) for k, r in zip(keys, rows)])
+        by_group: dict[int, list[int]] = {}
+        for k, r in zip(keys, rows):
+            by_group.setdefault(ids[k["fingerprint"]], []).append(r.id)
+        for gid, issue_ids in by_group.items():
+            db.session.execute(T.update().where(T.c.id.in_(issue_ids)).values(group_id=gid))
+        db.session.commit()
+        done += len(rows)
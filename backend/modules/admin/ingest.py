@@ -0,0 +1,140 @@
+# backend/modules/admin/ingest.py
+"""
+Buffered ingestion for POST /admin/issues.
+
+Reports are admitted (or dropped) by per-client and per-URL rate limits,
+then queued in memory; a flusher thread turns them into rows (JSON +
+compression happen there, off the request path), stores the payloads not
+seen before (issue_blobs) and writes the issues with one multi-row INSERT
+per batch, flushed every ISSUE_FLUSH_SIZE reports or
+ISSUE_FLUSH_SECONDS, whichever comes first. The same transaction updates
+the fingerprint group counters (modules.admin.grouping).
+
+Everything is per worker and best-effort: a full queue drops new reports,
+a failed batch is logged and dropped, and a killed worker loses what it
+still held. Drops are counted by reason (see stats()).
+"""
+from __future__ import annotations
+
+import atexit, logging, threading, time
+from collections import Counter, deque
+from datetime import datetime
+
+from flask import Flask
+
+from extensions import db
+from .grouping import group_key, record
+from .models import Issue, IssueBlob
+
+log = logging.getLogger(__name__)
+
+ISSUE_QUEUE_MAX = 5_000
+ISSUE_FLUSH_SIZE = 200
+ISSUE_FLUSH_SECONDS = 2.0
+RATE_WINDOW_SECONDS = 60
+RATE_PER_CLIENT = 30    # reports per client per window
+RATE_PER_URL = 120      # reports per method+URL per window, across clients
+
+
+class RateLimiter:
+    """Fixed-window counters; all keys reset together when the window rolls over."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._started = time.monotonic()
+        self._counts: Counter = Counter()
+
+    def allow(self, key) -> bool:
+        now = time.monotonic()
+        if now - self._started >= self.window:
+            self._started = now
+            self._counts.clear()
+        self._counts[key] += 1
+        return self._counts[key] <= self.limit
+
+
+class IssueIngestor:
+    def __init__(self):
+        self._queue: deque = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._app: Flask | None = None
+        self._per_client = RateLimiter(RATE_PER_CLIENT, RATE_WINDOW_SECONDS)
+        self._per_url = RateLimiter(RATE_PER_URL, RATE_WINDOW_SECONDS)
+        self.counters: Counter = Counter()
+
+    def submit(self, app: Flask, payload: dict, client_key: str) -> str | None:
+        """Queue a report; returns None when accepted, else the drop reason."""
+        url_key = (payload.get("method"), (payload.get("url") or "").split("?", 1)[0])
+        payload["received_at"] = datetime.utcnow()
+        with self._lock:
+            if not self._per_client.allow(client_key):
+                reason = "rate_limited_client"
+            elif not self._per_url.allow(url_key):
+                reason = "rate_limited_url"
+            elif len(self._queue) >= ISSUE_QUEUE_MAX:
+                reason = "queue_full"
+            else:
+                reason = None
+                self._queue.append(payload)
+                self._ensure_thread(app)
+            self.counters["dropped_" + reason if reason else "accepted"] += 1
+            size = len(self._queue)
+        if size >= ISSUE_FLUSH_SIZE:
+            self._wake.set()
+        return reason
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"queued": len(self._queue), **self.counters}
+
+    def _ensure_thread(self, app: Flask) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._app = app
+            self._thread = threading.Thread(target=self._run, name="issue-ingest", daemon=True)
+            self._thread.start()
+
+    def _take(self, n: int) -> list:
+        with self._lock:
+            return [self._queue.popleft() for _ in range(min(n, len(self._queue)))]
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(ISSUE_FLUSH_SECONDS)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything queued so far, ISSUE_FLUSH_SIZE rows per INSERT."""
+        if self._app is None:
+            return
+        with self._app.app_context():
+            while True:
+                batch = self._take(ISSUE_FLUSH_SIZE)
+                if not batch:
+                    return
+                try:
+                    keys = [group_key(p.get("method"), p.get("url"), p.get("status"), p.get("response"))
+                            for p in batch]
+                    ids = record([(k, p["received_at"]) for k, p in zip(keys, batch)])
+                    blobs: dict = {}
+                    rows = [{**Issue.row_from_payload(p, blobs), "group_id": ids[k["fingerprint"]]}
+                            for k, p in zip(keys, batch)]
+                    IssueBlob.store(blobs)
+                    db.session.execute(Issue.__table__.insert(), rows)
+                    db.session.commit()
+                    outcome = "flushed"
+                except Exception:
+                    log.exception("dropping %d issue reports", len(batch))
+                    db.session.rollback()
+                    outcome = "dropped_failed"
+                finally:
+                    db.session.remove()
+                with self._lock:
+                    self.counters[outcome] += len(batch)
+
+
+ingestor = IssueIngestor()
+atexit.register(ingestor.flush)
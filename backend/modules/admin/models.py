@@ -1,12 +1,15 @@
 # backend/modules/admin/models.py
-import json, zlib
+import hashlib, json
 from datetime import datetime
-from sqlalchemy import Index
+from flask import current_app
+from sqlalchemy import Index, insert, select
 from extensions import db
+from modules.core.cache import VersionedCache
+from . import codec
 
 
-def _to_blob(obj, max_chars: int = 100_000):
-    """Serialize to JSON (fallback to str), truncate, then compress."""
+def _to_text(obj, max_chars: int = 100_000):
+    """Serialize to JSON (fallback to str), then truncate."""
     try:
         s = json.dumps(obj, ensure_ascii=False, default=str)
     except Exception:
@@ -18,14 +21,42 @@ def _to_blob(obj, max_chars: int = 100_000):
         return None
     if len(s) > max_chars:
         s = s[:max_chars] + f'... (truncated {len(s)-max_chars} chars)'
-    return zlib.compress(s.encode("utf-8"))
+    return s
+
+
+# dictionaries never change once stored; only "which one is newest" can go stale
+_zdicts: dict = {}
+_encoder_cache = VersionedCache("issue_blob_encoder", maxsize=1, ttl=300)
+
+
+def _zdict(dict_id: int) -> bytes:
+    if dict_id not in _zdicts:
+        _zdicts[dict_id] = db.session.execute(
+            select(IssueBlobDict.data).where(IssueBlobDict.id == dict_id)
+        ).scalar_one()
+    return _zdicts[dict_id]
+
+
+def _encoder():
+    """Codec for new blobs: the newest trained dictionary unless ISSUE_BLOB_CODEC = "zlib"."""
+    if current_app.config.get("ISSUE_BLOB_CODEC", "dict") != "dict":
+        return codec.ZlibCodec()
+
+    def newest():
+        row = db.session.execute(
+            select(IssueBlobDict.id, IssueBlobDict.data).order_by(IssueBlobDict.id.desc()).limit(1)
+        ).first()
+        return codec.DictCodec(row.id, row.data) if row else codec.ZlibCodec()
+
+    return _encoder_cache.get_or_set("newest", (IssueBlobDict.__tablename__,), newest)[0]
 
 
 def _from_blob(blob):
+    """Payload of a stored blob, any codec (see modules.admin.codec)."""
     if not blob:
         return None
     try:
-        s = zlib.decompress(blob).decode("utf-8", errors="replace")
+        s = codec.decode(blob, _zdict).decode("utf-8", errors="replace")
         try:
             return json.loads(s)
         except Exception:
@@ -34,6 +65,87 @@ def _from_blob(blob):
         return None
 
 
+def blob_hash(raw: bytes) -> str:
+    """Content address of a payload: sha256 of its (uncompressed) JSON text."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _blob_ref(obj, blobs: dict):
+    """Hash of obj's payload; its encoded bytes go into blobs[hash] for IssueBlob.store."""
+    s = _to_text(obj)
+    if s is None:
+        return None
+    raw = s.encode("utf-8")
+    h = blob_hash(raw)
+    if h not in blobs:
+        blobs[h] = _encoder().encode(raw)
+    return h
+
+
+class IssueBlobDict(db.Model):
+    """Trained compression dictionaries for issue_blobs (codec.DictCodec); never updated."""
+    __tablename__ = "issue_blob_dicts"
+
+    id = db.Column(db.Integer, primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    samples = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    @classmethod
+    def train(cls, sample_size: int = 2_000) -> "IssueBlobDict | None":
+        """Train on the newest `sample_size` stored payloads and store the result (None without samples)."""
+        rows = db.session.execute(
+            select(IssueBlob.data).order_by(IssueBlob.created_at.desc()).limit(sample_size)
+        ).scalars().all()
+        samples = [codec.decode(b, _zdict) for b in rows]
+        data = codec.train_dictionary(samples)
+        if not data:
+            return None
+        d = cls(data=data, samples=len(samples))
+        db.session.add(d)
+        db.session.commit()
+        return d
+
+
+class IssueBlob(db.Model):
+    """Request/response/headers payloads of issues, stored once per distinct content."""
+    __tablename__ = "issue_blobs"
+
+    hash = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    @classmethod
+    def store(cls, blobs: dict) -> None:
+        """Insert {hash: data} that aren't stored yet (a concurrent insert of the same hash is ignored)."""
+        if not blobs:
+            return
+        table = cls.__table__
+        have = set(db.session.execute(select(table.c.hash).where(table.c.hash.in_(list(blobs)))).scalars())
+        now = datetime.utcnow()
+        rows = [{"hash": h, "data": d, "created_at": now} for h, d in sorted(blobs.items()) if h not in have]
+        if not rows:
+            return
+        dialect = db.engine.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as psql_insert
+            stmt = psql_insert(table).values(rows).on_conflict_do_nothing(index_elements=[table.c.hash])
+        elif dialect in {"mysql", "mariadb"}:
+            stmt = insert(table).values(rows).prefix_with("IGNORE")
+        else:
+            stmt = insert(table).values(rows).prefix_with("OR IGNORE")
+        db.session.execute(stmt)
+
+    @classmethod
+    def load(cls, hashes) -> dict:
+        """{hash: decoded payload} for the given hashes (None entries skipped), one query."""
+        wanted = {h for h in hashes if h}
+        if not wanted:
+            return {}
+        rows = db.session.execute(select(cls.hash, cls.data).where(cls.hash.in_(wanted))).all()
+        return {h: _from_blob(d) for h, d in rows}
+
+
 class Issue(db.Model):
     __tablename__ = "issues"
 
@@ -58,18 +170,27 @@ class Issue(db.Model):
     full_url = db.Column(db.Text)
     app_version = db.Column(db.String(64))
     pr_url = db.Column(db.String(512))
-    request_blob  = db.Column(db.LargeBinary)
-    response_blob = db.Column(db.LargeBinary)
-    headers_blob  = db.Column(db.LargeBinary)
+    # payloads live in issue_blobs (deduplicated); listing never touches them
+    request_hash  = db.Column(db.String(64), db.ForeignKey("issue_blobs.hash"))
+    response_hash = db.Column(db.String(64), db.ForeignKey("issue_blobs.hash"))
+    headers_hash  = db.Column(db.String(64), db.ForeignKey("issue_blobs.hash"))
+
+    # fingerprint group (modules.admin.grouping); NULL until grouped
+    group_id = db.Column(db.Integer, db.ForeignKey("issue_groups.id", ondelete="SET NULL"), index=True)
 
     __table_args__ = (
         Index("ix_issues_status_created", "status", "created_at"),
     )
 
     @classmethod
-    def from_payload(cls, payload: dict):
+    def row_from_payload(cls, payload: dict, blobs: dict) -> dict:
+        """
+        Column values for a report (see modules.admin.ingest for the batched insert).
+        Payload bytes are collected into blobs {hash: data}; IssueBlob.store them first.
+        """
         client = payload.get("client") or {}
-        return cls(
+        return dict(
+            created_at  = payload.get("received_at") or datetime.utcnow(),
             method      = payload.get("method"),
             url         = payload.get("url"),
             http_status = payload.get("status"),
@@ -83,11 +204,18 @@ class Issue(db.Model):
             route       = client.get("route"),
             full_url    = client.get("full_url"),
             app_version = client.get("app_version"),
-            request_blob  = _to_blob(payload.get("request")),
-            response_blob = _to_blob(payload.get("response")),
-            headers_blob  = _to_blob(payload.get("headers")),
+            request_hash  = _blob_ref(payload.get("request"), blobs),
+            response_hash = _blob_ref(payload.get("response"), blobs),
+            headers_hash  = _blob_ref(payload.get("headers"), blobs),
         )
 
+    @classmethod
+    def from_payload(cls, payload: dict):
+        blobs: dict = {}
+        issue = cls(**cls.row_from_payload(payload, blobs))
+        IssueBlob.store(blobs)
+        return issue
+
     def to_summary(self) -> dict:
         """Small payload for Super Admin list."""
         return {
@@ -99,12 +227,58 @@ class Issue(db.Model):
             "http_status": self.http_status,
             "note": self.note,
             "pr_url": self.pr_url,
+            "group_id": self.group_id,
+        }
+
+    def payloads(self) -> dict:
+        """{"request", "response", "headers"} in one query."""
+        loaded = IssueBlob.load((self.request_hash, self.response_hash, self.headers_hash))
+        return {
+            "request": loaded.get(self.request_hash),
+            "response": loaded.get(self.response_hash),
+            "headers": loaded.get(self.headers_hash),
         }
 
     # Optional accessors for internal tools
     @property
-    def request(self):  return _from_blob(self.request_blob)
+    def request(self):  return IssueBlob.load([self.request_hash]).get(self.request_hash)
     @property
-    def response(self): return _from_blob(self.response_blob)
+    def response(self): return IssueBlob.load([self.response_hash]).get(self.response_hash)
     @property
-    def headers(self):  return _from_blob(self.headers_blob)
+    def headers(self):  return IssueBlob.load([self.headers_hash]).get(self.headers_hash)
+
+
+class IssueGroup(db.Model):
+    """Issues sharing a fingerprint (method, URL template, HTTP status, message); counters kept on insert."""
+    __tablename__ = "issue_groups"
+
+    id = db.Column(db.Integer, primary_key=True)
+    fingerprint = db.Column(db.String(40), nullable=False, unique=True)
+    method = db.Column(db.String(10))
+    url_template = db.Column(db.String(512))
+    http_status = db.Column(db.Integer)
+    message = db.Column(db.String(255))
+    first_seen = db.Column(db.DateTime, nullable=False)
+    last_seen = db.Column(db.DateTime, nullable=False, index=True)
+    occurrences = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "url_template": self.url_template,
+            "http_status": self.http_status,
+            "message": self.message,
+            "first_seen": self.first_seen.isoformat() + "Z",
+            "last_seen": self.last_seen.isoformat() + "Z",
+            "occurrences": self.occurrences,
+        }
+
+
+class IssueGroupDay(db.Model):
+    """Occurrences of a group per UTC day (histograms read these, never the issues)."""
+    __tablename__ = "issue_group_days"
+
+    group_id = db.Column(db.Integer, db.ForeignKey("issue_groups.id", ondelete="CASCADE"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
@@ -1,13 +1,23 @@
 # backend/modules/admin/routes.py
 from __future__ import annotations
-from flask import Blueprint, request
-from sqlalchemy import desc, asc
+import time
+from datetime import datetime, timedelta
+import click
+from flask import Blueprint, current_app, request
+from sqlalchemy import desc, asc, text
 from extensions import db
-from common.utils.http import json_body, ok, error, pag_params
+from common.utils.http import json_body, ok, ok_etag, json_etag, error, pag_params
 from common.utils.authz import superuser_required
-from .models import Issue
-from flask_jwt_extended import jwt_required
+from db_pool import pool_stats
+from db_routing import replica_engines, use_primary
+from .models import Issue, IssueBlobDict, IssueGroup, IssueGroupDay
+from .ingest import ingestor
+from .grouping import group_existing
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from modules.core.models import AppModule as Module, AppModuleTab
+from modules.core.pagination import paginate, parse_total_mode
+from modules.core.cache import VersionedCache
+from common.utils.conditional import conditional, max_updated
 
 bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -24,7 +34,7 @@ def create_issue():
     client.setdefault("locale", request.headers.get("X-Client-Locale"))
     client.setdefault("app_version", request.headers.get("X-App-Version"))
 
-    issue = Issue.from_payload({
+    payload = {
         "method": body.get("method") if hasattr(body, "get") else None,
         "url": body.get("url") if hasattr(body, "get") else None,
         "status": (body.get("status") if hasattr(body, "get") else None) or 500,
@@ -33,10 +43,20 @@ def create_issue():
         "request": body.get("request") if hasattr(body, "get") else None,
         "response": body.get("response") if hasattr(body, "get") else None,
         "headers": body.get("headers") if hasattr(body, "get") else None,
-    })
-    db.session.add(issue)
-    db.session.commit()
-    return ok({"id": issue.id, "created_at": issue.created_at.isoformat() + "Z"}, 201)
+    }
+    # queued and written in batches (modules.admin.ingest); no id until the flush
+    # remote_addr, not X-Forwarded-For: that header is client-controlled unless ProxyFix (app.py) vets it
+    client_key = get_jwt_identity() or request.remote_addr
+    dropped = ingestor.submit(current_app._get_current_object(), payload, client_key)
+    return ok({"id": None, "queued": dropped is None, "reason": dropped}, 202)
+
+
+@bp.get("/issues/ingest-stats")
+@jwt_required()
+@superuser_required
+def issue_ingest_stats():
+    """This worker's ingestion counters: accepted, flushed, dropped_<reason>, queued."""
+    return ok(ingestor.stats())
 
 
 @bp.get("/issues")
@@ -44,19 +64,72 @@ def create_issue():
 @superuser_required
 def list_issues():
     status = request.args.get("status")
+    group_id = request.args.get("group_id", type=int)
     page, per_page = pag_params()
     q = Issue.query
     if status:
         q = q.filter(Issue.status == status)
-    total = q.count()
-    items = (
-        q.order_by(desc(Issue.created_at))
-         .offset((page - 1) * per_page)
-         .limit(per_page)
-         .all()
+    if group_id:
+        q = q.filter(Issue.group_id == group_id)
+    p = paginate(q.order_by(desc(Issue.created_at)), page, per_page, total_mode=parse_total_mode())
+    return ok({"items": [i.to_summary() for i in p.items],
+               "page": page, "per_page": per_page, "total": p.total,
+               "total_exact": p.total_exact, "has_next": p.has_next})
+
+
+@bp.get("/issue-groups")
+@jwt_required()
+@superuser_required
+def list_issue_groups():
+    """
+    One row per fingerprint, most recently seen first (?sort=occurrences for the noisiest).
+    Drill into a group with GET /admin/issues?group_id=<id>.
+    """
+    page, per_page = pag_params()
+    order = desc(IssueGroup.occurrences) if request.args.get("sort") == "occurrences" else desc(IssueGroup.last_seen)
+    p = paginate(IssueGroup.query.order_by(order, desc(IssueGroup.id)), page, per_page,
+                 total_mode=parse_total_mode())
+    return ok({"items": [g.to_summary() for g in p.items],
+               "page": page, "per_page": per_page, "total": p.total,
+               "total_exact": p.total_exact, "has_next": p.has_next})
+
+
+@bp.get("/issue-groups/<int:group_id>/histogram")
+@jwt_required()
+@superuser_required
+def issue_group_histogram(group_id: int):
+    """Occurrences per UTC day for the last ?days (default 30, max 365), oldest first, zero-filled."""
+    group = db.session.get(IssueGroup, group_id)
+    if not group:
+        return error("Not found", 404)
+    days = min(max(request.args.get("days", 30, type=int), 1), 365)
+    end = datetime.utcnow().date()
+    start = end - timedelta(days=days - 1)
+    counts = dict(
+        db.session.query(IssueGroupDay.day, IssueGroupDay.count)
+        .filter(IssueGroupDay.group_id == group_id, IssueGroupDay.day >= start)
+        .all()
     )
-    return ok({"items": [i.to_summary() for i in items],
-               "page": page, "per_page": per_page, "total": total})
+    series = [start + timedelta(days=i) for i in range(days)]
+    return ok({**group.to_summary(),
+               "days": [{"day": d.isoformat(), "count": counts.get(d, 0)} for d in series]})
+
+
+@bp.cli.command("group-issues")
+def group_issues_command():
+    """Assign fingerprint groups to issues stored before grouping existed."""
+    print(f"{group_existing()} issues grouped")
+
+
+@bp.cli.command("train-blob-dict")
+@click.option("--sample", default=2000, show_default=True, help="Newest stored payloads to train on.")
+def train_blob_dict_command(sample: int):
+    """Train a compression dictionary for new issue payloads (old blobs keep theirs)."""
+    d = IssueBlobDict.train(sample)
+    if d is None:
+        print("No payloads to train on")
+        return
+    print(f"Dictionary {d.id}: {len(d.data):,} bytes from {d.samples} payloads")
 
 
 @bp.get("/issues/<int:issue_id>")
@@ -66,11 +139,7 @@ def get_issue(issue_id: int):
     issue = Issue.query.get(issue_id)
     if not issue:
         return error("Not found", 404)
-    data = issue.to_summary()
-    data["request"] = issue.request
-    data["response"] = issue.response
-    data["headers"] = issue.headers
-    return ok(data)
+    return ok({**issue.to_summary(), **issue.payloads()})
 
 
 @bp.patch("/issues/<int:issue_id>")
@@ -93,11 +162,39 @@ def update_issue(issue_id: int):
     db.session.commit()
     return ok(issue.to_summary())
 
+# ----------------------------- health (superuser-only) ----------------------------- #
+
+@bp.get("/health")
+@jwt_required()
+@superuser_required
+@use_primary()
+def health():
+    """
+    This worker's connection pools, primary and replicas (size, checked out, overflow,
+    checkout waits/timeouts), and a SELECT 1 on the primary: checkout_ms to get a connection, round_trip_ms for the query. 503 if the DB fails.
+    """
+    data = {"dialect": db.engine.dialect.name}
+    try:
+        t0 = time.perf_counter()
+        conn = db.session.connection()
+        t1 = time.perf_counter()
+        conn.execute(text("SELECT 1"))
+        t2 = time.perf_counter()
+        data.update(status="ok", checkout_ms=round((t1 - t0) * 1000, 2), round_trip_ms=round((t2 - t1) * 1000, 2))
+    except Exception as exc:
+        db.session.rollback()
+        data.update(status="error", error=str(exc)[:200])
+    data["pool"] = pool_stats(db.engine)
+    data["replicas"] = [pool_stats(e) for e in replica_engines(current_app)]
+    return ok(data, 200 if data["status"] == "ok" else 503)
+
+
 # ----------------------------- modules (superuser-only) ----------------------------- #
 
 @bp.get("/modules")
 @jwt_required()
 @superuser_required
+@conditional(lambda: max_updated(Module))
 def list_modules():
     items = Module.query.order_by(Module.code.asc()).all()
     return ok([m.to_dict() for m in items])
@@ -117,6 +214,7 @@ def create_module():
     )
     db.session.add(m)
     db.session.commit()
+    invalidate_modules_tree()
     return ok(m.to_dict(), 201)
 
 
@@ -132,6 +230,7 @@ def update_module(code: str):
         if f in body:
             setattr(m, f, body[f])
     db.session.commit()
+    invalidate_modules_tree()
     return ok(m.to_dict())
 
 
@@ -139,6 +238,7 @@ def update_module(code: str):
 @bp.get("/modules/<string:module_code>/tabs")
 @jwt_required()
 @superuser_required
+@conditional(lambda module_code: max_updated(AppModuleTab, AppModuleTab.module_code == module_code))
 def list_tabs(module_code: str):
     mod = Module.query.filter_by(code=module_code).first()
     if not mod:
@@ -171,6 +271,7 @@ def create_tab(module_code: str):
     )
     db.session.add(t)
     db.session.commit()
+    invalidate_modules_tree()
     return ok(t.to_dict(), 201)
 
 
@@ -186,54 +287,42 @@ def update_tab(module_code: str, tab_code: str):
         if f in body:
             setattr(t, f, body[f])
     db.session.commit()
+    invalidate_modules_tree()
     return ok(t.to_dict())
 
 
 # ---------- NEW: modules tree (for FE navigation, not superuser-only) ----------
-@bp.get("/modules/tree")
-@jwt_required()  # let any authenticated user load their navigation tree (filtered to active)
-def modules_tree():
-    """
-    Returns modules -> tabs in a FE-friendly shape.
-    Supports ?include=tabs[,sections] (sections reserved for future use).
-    Only active modules/tabs are returned. Sorting by sort_order then code when available.
-    """
-    include = (request.args.get("include") or "").lower().split(",")
-    include_tabs = "tabs" in include
-    include_sections = "sections" in include  # placeholder for future extension
+# Built once per (include flags) and reused until app_modules/app_module_tabs change.
+_tree_cache = VersionedCache("modules_tree", maxsize=8, ttl=300)
+_TREE_TABLES = ("app_modules", "app_module_tabs")
+
+
+def invalidate_modules_tree() -> None:
+    _tree_cache.invalidate()
 
-    # Order by sort_order if present on the model, then by code
-    has_mod_sort = hasattr(Module, "sort_order")
-    mod_order = [asc(Module.sort_order)] if has_mod_sort else []
-    mod_order.append(asc(Module.code))
 
-    modules_q = Module.query.filter_by(is_active=True).order_by(*mod_order)
-    modules = modules_q.all()
+def _build_modules_tree(include_tabs: bool, include_sections: bool) -> dict:
+    # Module.tabs is selectin-loaded and pre-ordered by (sort_order, code): 2 queries total.
+    modules = Module.query.filter_by(is_active=True).order_by(asc(Module.sort_order), asc(Module.code)).all()
 
     def module_node(m: Module) -> dict:
         node = {
             "code": m.code,
-            "name": getattr(m, "name_en", None) or m.code,
+            "name": m.name_en or m.code,
             "icon": getattr(m, "icon", None),
-            "sort_order": getattr(m, "sort_order", 0),
-            "is_locked": getattr(m, "is_locked", False),
+            "sort_order": m.sort_order,
+            "is_locked": m.is_locked,
         }
         if include_tabs:
-            has_tab_sort = hasattr(AppModuleTab, "sort_order")
-            tab_order = [asc(AppModuleTab.sort_order)] if has_tab_sort else []
-            tab_order.append(asc(AppModuleTab.code))
-            tabs_q = (
-                AppModuleTab.query
-                .filter_by(module_code=m.code, is_active=True)
-                .order_by(*tab_order)
-            )
             tabs = []
-            for t in tabs_q.all():
+            for t in m.tabs:
+                if not t.is_active:
+                    continue
                 tab_node = {
                     "code": t.code,
-                    "name": getattr(t, "name_en", None) or t.code,
-                    "sort_order": getattr(t, "sort_order", 0),
-                    "is_locked": getattr(t, "is_locked", False),
+                    "name": t.name_en or t.code,
+                    "sort_order": t.sort_order,
+                    "is_locked": t.is_locked,
                 }
                 if include_sections:
                     # sections are not modeled yet; reserve the field
@@ -242,5 +331,25 @@ def modules_tree():
             node["tabs"] = tabs
         return node
 
-    data = {"modules": [module_node(m) for m in modules]}
-    return ok(data)
+    return {"modules": [module_node(m) for m in modules]}
+
+
+@bp.get("/modules/tree")
+@jwt_required()  # let any authenticated user load their navigation tree (filtered to active)
+def modules_tree():
+    """
+    Returns modules -> tabs in a FE-friendly shape.
+    Supports ?include=tabs[,sections] (sections reserved for future use).
+    Only active modules/tabs are returned. Sorting by sort_order then code.
+    Served with an ETag; If-None-Match on an unchanged tree gets 304.
+    """
+    include = (request.args.get("include") or "").lower().split(",")
+    include_tabs = "tabs" in include
+    include_sections = include_tabs and "sections" in include  # placeholder for future extension
+
+    def build():
+        data = _build_modules_tree(include_tabs, include_sections)
+        return data, json_etag(data)
+
+    data, etag = _tree_cache.get_or_set((include_tabs, include_sections), _TREE_TABLES, build)[0]
+    return ok_etag(data, etag)
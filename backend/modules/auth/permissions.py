@@ -1,7 +1,47 @@
 from functools import wraps
 from flask import jsonify
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
-from ..users.models import User
+from sqlalchemy import select
+from extensions import db
+from modules.core.cache import VersionedCache, table_versions, watch_column
+from modules.core.constants import PERMISSION_CACHE_TTL
+from ..users.models import User, Role, Permission, roles_permissions
+
+# Tables whose writes change what a role may do; their write counter is the permission version.
+PERMISSION_TABLES = ("roles", "permissions", "roles_permissions")
+
+# a user's role is users.role_id: version it on that column, not on every profile/last-login write
+USER_ROLE_VERSION = "users.role_id"
+watch_column("users", "role_id", USER_ROLE_VERSION)
+
+_user_roles = VersionedCache("user_roles", maxsize=10_000, ttl=PERMISSION_CACHE_TTL)
+_role_perms = VersionedCache("role_permissions", maxsize=256, ttl=PERMISSION_CACHE_TTL)
+
+
+def permission_version() -> tuple:
+    return table_versions(PERMISSION_TABLES)
+
+
+def _role_id_for(uid) -> int | None:
+    def load():
+        return db.session.execute(select(User.role_id).where(User.id == int(uid))).scalar()
+    role_id, _ = _user_roles.get_or_set(int(uid), (USER_ROLE_VERSION,), load)
+    return role_id
+
+
+def role_permissions(role_id: int) -> tuple[str | None, frozenset]:
+    """(role code, permission codes) for a role, cached until the permission version changes."""
+    def load():
+        code = db.session.execute(select(Role.code).where(Role.id == role_id)).scalar()
+        perms = db.session.execute(
+            select(Permission.code)
+            .join(roles_permissions, roles_permissions.c.permission_id == Permission.id)
+            .where(roles_permissions.c.role_id == role_id)
+        ).scalars().all()
+        return code, frozenset(perms)
+    value, _ = _role_perms.get_or_set(role_id, PERMISSION_TABLES, load)
+    return value
+
 
 def permission_required(code: str):
     def decorator(fn):
@@ -9,10 +49,11 @@ def permission_required(code: str):
         def wrapper(*args, **kwargs):
             verify_jwt_in_request()
             uid = get_jwt_identity()
-            user = User.query.get(uid)
-            if not user:
+            role_id = _role_id_for(uid) if uid is not None else None
+            if role_id is None:
                 return jsonify({"message": "User not found"}), 404
-            if user.is_admin or code in user.permissions():
+            role_code, perms = role_permissions(role_id)
+            if role_code == "admin" or code in perms:
                 return fn(*args, **kwargs)
             return jsonify({"message": "Forbidden: missing permission", "required": code}), 403
         return wrapper
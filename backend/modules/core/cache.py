@@ -0,0 +1,172 @@
+# modules/core/cache.py
+"""
+In-process caches invalidated by table write versions.
+
+Every INSERT/UPDATE/DELETE that goes through any Engine bumps a per-table
+counter (at execute time and again on commit), so cache entries that
+remember the versions of the tables they were built from go stale as soon
+as this worker writes to them. Writes made by *other* workers are not seen,
+which is why every cache also carries a TTL.
+"""
+from __future__ import annotations
+
+import threading, time, weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from db_routing import use_primary
+
+_lock = threading.Lock()
+_versions: dict[str, int] = {}
+_commit_listeners: list[Callable[[set[str]], None]] = []
+_watched: dict[str, dict[str, str]] = {}  # table -> {column: version key}, see watch_column
+_caches: "weakref.WeakSet[VersionedCache]" = weakref.WeakSet()
+
+
+def table_versions(tables: Iterable[str]) -> tuple:
+    with _lock:
+        return tuple(_versions.get(t, 0) for t in tables)
+
+
+def bump_tables(*tables: str) -> None:
+    with _lock:
+        for t in tables:
+            _versions[t] = _versions.get(t, 0) + 1
+
+
+def on_commit(fn: Callable[[set[str]], None]) -> None:
+    """Call `fn(tables)` after every commit on this worker that wrote to `tables`."""
+    _commit_listeners.append(fn)
+
+
+def watch_column(table: str, column: str, key: str) -> None:
+    """
+    Also bump version `key` on every INSERT/DELETE of `table` and on UPDATEs
+    that set `column`, so a cache of just that column can depend on `key`
+    and survive unrelated writes to the table.
+    """
+    _watched.setdefault(table, {})[column] = key
+
+
+def _set_columns(compiled, stmt) -> set[str]:
+    # ORM flushes pass the SET columns as parameters, Core .values() keeps them on the statement
+    keys = set(getattr(compiled, "column_keys", None) or ())
+    keys.update(getattr(k, "key", k) for k in (getattr(stmt, "_values", None) or {}))
+    return keys
+
+
+def _written_tables(context) -> set[str]:
+    compiled = getattr(context, "compiled", None)
+    stmt = getattr(compiled, "statement", None)
+    table = getattr(stmt, "table", None)
+    name = getattr(table, "name", None)
+    if not name:
+        return set()
+    tables = {name}
+    watched = _watched.get(name)
+    if watched:
+        columns = _set_columns(compiled, stmt) if context.isupdate else watched
+        tables.update(key for column, key in watched.items() if column in columns)
+    return tables
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _track_writes(conn, cursor, statement, parameters, context, executemany):
+    if not (context.isinsert or context.isupdate or context.isdelete):
+        return
+    tables = _written_tables(context)
+    if tables:
+        conn.info.setdefault("written_tables", set()).update(tables)
+        bump_tables(*tables)
+
+
+@event.listens_for(Engine, "commit")
+def _bump_on_commit(conn):
+    # bump again so readers that cached between execute and commit are dropped too
+    tables = conn.info.pop("written_tables", None)
+    if tables:
+        bump_tables(*tables)
+        for fn in _commit_listeners:
+            fn(tables)
+
+
+@event.listens_for(Engine, "rollback")
+def _forget_on_rollback(conn):
+    conn.info.pop("written_tables", None)
+
+
+class VersionedCache:
+    """
+    Small LRU whose entries are valid while the versions of their dependent
+    tables are unchanged and their TTL has not expired.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float | None = 60.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    def get(self, key: Hashable, tables: Iterable[str] = ()) -> tuple[bool, Any]:
+        tables = tuple(tables)
+        versions = table_versions(tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                vers, expires, value = entry
+                if vers == versions and (expires is None or expires > now):
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+            self.misses += 1
+        return False, None
+
+    def set(self, key: Hashable, value: Any, tables: Iterable[str] = (), versions: tuple | None = None) -> None:
+        """Pass `versions` captured *before* computing the value to avoid caching a racing write."""
+        if versions is None:
+            versions = table_versions(tuple(tables))
+        expires = (time.monotonic() + self.ttl) if self.ttl else None
+        with self._lock:
+            self._data[key] = (versions, expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, tables: Iterable[str], fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """
+        Returns (value, was_cached). `fn` reads from the primary: a lagging
+        replica would store old rows under the new table versions.
+        """
+        tables = tuple(tables)
+        hit, value = self.get(key, tables)
+        if hit:
+            return value, True
+        versions = table_versions(tables)
+        with use_primary():
+            value = fn()
+        self.set(key, value, versions=versions)
+        return value, False
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"name": self.name, "size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+def all_caches() -> list[VersionedCache]:
+    """Every live VersionedCache of this process (for metrics)."""
+    return list(_caches)
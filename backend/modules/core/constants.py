@@ -1,3 +1,40 @@
+import os
+
 # Global API defaults
 DEFAULT_PAGE_SIZE = 50
 MAX_PAGE_SIZE = 100
+
+# ?total=estimate: serve cached counts for this long; on Postgres, planner
+# estimates below the threshold are cheap enough to count exactly.
+COUNT_CACHE_TTL = 30
+EXACT_COUNT_BELOW_ESTIMATE = 10_000
+
+# In-process trigram search index (SQLite/MySQL; Postgres uses pg_trgm GIN indexes)
+SEARCH_INDEX_REFRESH_SECONDS = 5
+SEARCH_MAX_CANDIDATES = 5_000
+
+# Role -> permission-set cache used by permission_required. Local writes to
+# users/roles/permissions/roles_permissions invalidate it at once; the TTL
+# bounds how long other workers' grants/revocations can go unseen.
+PERMISSION_CACHE_TTL = 60
+
+# Per-user unread notification counts (modules.notifications.inbox). Local
+# writes invalidate at once; other workers' writes show up within the TTL.
+NOTIFICATION_COUNT_TTL = 30
+
+# Live notification stream (SSE). In production streams are served by the
+# Procfile's `stream` process (gevent worker, gunicorn.conf.py), where an open
+# stream is a greenlet: up to SSE_WORKER_CONNECTIONS per worker, the same
+# variable the Procfile passes to --worker-connections. When a threaded worker
+# serves the route (flask run, or the `web` process), each stream holds a
+# thread for up to SSE_MAX_SECONDS (the browser then reconnects with
+# Last-Event-ID and catches up), so streams may take at most SSE_THREAD_SHARE
+# of its threads: 4 of the Procfile's 16, leaving 12 for the API and its 30 s
+# exports. WEB_THREADS is the same variable the Procfile passes to --threads.
+WEB_THREADS = int(os.getenv("WEB_THREADS", "16"))
+SSE_THREAD_SHARE = 0.25
+SSE_MAX_CLIENTS = max(1, int(WEB_THREADS * SSE_THREAD_SHARE))
+SSE_WORKER_CONNECTIONS = int(os.getenv("SSE_WORKER_CONNECTIONS", "1000"))
+SSE_MAX_SECONDS = 300
+SSE_HEARTBEAT_SECONDS = 15
+SSE_POLL_SECONDS = 5
@@ -0,0 +1,48 @@
+# modules/core/jobs.py
+"""
+Minimal in-process background jobs with DB-backed status.
+
+The work runs on a daemon thread of the worker that accepted the request;
+progress lives in `background_jobs`, so any worker can answer a status poll.
+A job whose worker dies mid-run stays 'running' (no retry/resume).
+"""
+from __future__ import annotations
+
+import logging, threading, uuid
+from datetime import datetime
+from typing import Callable
+
+from flask import current_app
+from extensions import db
+from .models import BackgroundJob
+
+log = logging.getLogger(__name__)
+
+
+def start_job(kind: str, target: Callable[[BackgroundJob], None], created_by: int | None = None) -> BackgroundJob:
+    """Create the job row, then run `target(job)` in a thread with its own app context/session."""
+    job = BackgroundJob(id=uuid.uuid4().hex, kind=kind, status="queued", created_by=created_by)
+    db.session.add(job)
+    db.session.commit()
+    app = current_app._get_current_object()
+    job_id = job.id
+
+    def runner():
+        with app.app_context():
+            job = db.session.get(BackgroundJob, job_id)
+            job.status = "running"
+            db.session.commit()
+            try:
+                target(job)
+                job.status = "done"
+            except Exception as exc:  # keep the worker alive; report on the job
+                log.exception("job %s (%s) failed", job_id, kind)
+                db.session.rollback()
+                job = db.session.get(BackgroundJob, job_id)
+                job.status = "failed"
+                job.message = str(exc)[:2000]
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+
+    threading.Thread(target=runner, name=f"job-{kind}-{job_id[:8]}", daemon=True).start()
+    return job
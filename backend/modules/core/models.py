@@ -176,6 +176,64 @@ class Notification(db.Model, TimestampMixin):
     email_sent_at = db.Column(db.DateTime)
 
 
+class NotificationRead(db.Model):
+    """Per-user read marks for broadcast notifications (user_id IS NULL) above the inbox watermark."""
+    __tablename__ = "notification_reads"
+
+    notification_id = db.Column(db.Integer, db.ForeignKey("notifications.id", ondelete="CASCADE"), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    read_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class NotificationInbox(db.Model):
+    """Per-user watermark: broadcast notifications with id <= read_through count as read."""
+    __tablename__ = "notification_inboxes"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    read_through = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+# ---------------------------
+# Background jobs (long-running work started from HTTP, polled by id)
+# ---------------------------
+class BackgroundJob(db.Model, TimestampMixin):
+    __tablename__ = "background_jobs"
+    __table_args__ = (Index("ix_background_jobs_kind_created", "kind", "created_at"),)
+
+    id = db.Column(db.String(32), primary_key=True)                  # uuid4 hex
+    kind = db.Column(db.String(50), nullable=False)                   # e.g. 'hr.employees.import'
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued|running|done|failed
+    created_by = db.Column(db.Integer)                                # users.id (no FK: survives user deletes)
+    total = db.Column(db.Integer)                                     # None until known
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    succeeded = db.Column(db.Integer, nullable=False, default=0)
+    skipped = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    errors = db.Column(db.JSON)                                       # [{row, error}], capped
+    message = db.Column(db.Text)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self) -> str:
+        return f"<BackgroundJob {self.kind} {self.id} {self.status}>"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "succeeded": self.succeeded,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "errors": self.errors or [],
+            "message": self.message,
+            "created_at": self.created_at.isoformat() + "Z" if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() + "Z" if self.finished_at else None,
+        }
+
+
 # ---------------------------
 # Seed registry
 # ---------------------------
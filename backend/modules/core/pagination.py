@@ -1,19 +1,44 @@
+import base64, json
 from dataclasses import dataclass
 from math import ceil
 from flask import request
-from .constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from sqlalchemy import Table, and_, or_
+from sqlalchemy.sql.util import find_tables
+from .cache import VersionedCache
+from .constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, COUNT_CACHE_TTL, EXACT_COUNT_BELOW_ESTIMATE
+
+TOTAL_MODES = ("exact", "estimate", "none")
+
+count_cache = VersionedCache("counts", maxsize=2048, ttl=COUNT_CACHE_TTL)
 
 @dataclass
 class Page:
     items: list
     page: int
     size: int
-    total: int
+    total: int | None
+    total_exact: bool = True
+    more: bool | None = None  # only known without a total (?total=none)
 
     @property
-    def pages(self) -> int:
+    def pages(self) -> int | None:
+        if self.total is None:
+            return None
         return ceil(self.total / self.size) if self.size else 1
 
+    @property
+    def has_next(self) -> bool:
+        if self.total is None:
+            return bool(self.more)
+        return self.page * self.size < self.total
+
+@dataclass
+class CursorPage:
+    """Keyset page: no COUNT, no OFFSET; `next_cursor` is None on the last page."""
+    items: list
+    size: int
+    next_cursor: str | None
+
 def parse_pagination_args(default_size: int = DEFAULT_PAGE_SIZE, max_size: int = MAX_PAGE_SIZE):
     try:
         page = int(request.args.get("page", 1))
@@ -27,11 +52,119 @@ def parse_pagination_args(default_size: int = DEFAULT_PAGE_SIZE, max_size: int =
     page = max(1, page)
     return page, size
 
-def paginate(query, page: int, size: int) -> Page:
+def parse_cursor_arg() -> str | None:
+    """
+    Returns the raw ?cursor value, or None when the client asked for offset mode.
+    An empty ?cursor= means "first page in cursor mode".
+    """
+    if "cursor" not in request.args:
+        return None
+    return (request.args.get("cursor") or "").strip()
+
+def parse_total_mode(default: str = "exact") -> str:
+    """?total=exact|estimate|none (unknown values fall back to the default)."""
+    mode = (request.args.get("total") or "").strip().lower()
+    return mode if mode in TOTAL_MODES else default
+
+def _query_tables(stmt) -> tuple:
+    return tuple(sorted({t.name for t in find_tables(stmt, include_joins=True) if isinstance(t, Table)}))
+
+def _planner_estimate(query) -> int | None:
+    """Postgres only: row estimate from EXPLAIN, no table scan."""
+    session = query.session
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+    compiled = query.order_by(None).statement.compile(dialect=session.get_bind().dialect)
+    plan = session.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        return None
+
+def _cached_count(query) -> tuple[int, bool]:
+    """Returns (count, exact); a cache hit may miss other workers' writes for up to COUNT_CACHE_TTL."""
+    stmt = query.order_by(None).statement
+    compiled = stmt.compile(dialect=query.session.get_bind().dialect)
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    total, cached = count_cache.get_or_set(key, _query_tables(stmt), lambda: query.order_by(None).count())
+    return total, not cached
+
+def count_total(query, mode: str = "exact") -> tuple[int | None, bool]:
+    """(total, total_exact) for ?total=exact|estimate|none."""
+    if mode == "none":
+        return None, False
+    if mode == "estimate":
+        est = _planner_estimate(query)
+        if est is None:
+            return _cached_count(query)
+        if est >= EXACT_COUNT_BELOW_ESTIMATE:
+            return est, False
     # Avoid counting with ORDER BY for speed
-    total = query.order_by(None).count()
-    items = query.limit(size).offset((page - 1) * size).all()
-    return Page(items=items, page=page, size=size, total=total)
+    return query.order_by(None).count(), True
+
+def paginate(query, page: int, size: int, total_mode: str = "exact") -> Page:
+    offset = (page - 1) * size
+    if total_mode == "none":
+        rows = query.limit(size + 1).offset(offset).all()
+        return Page(items=rows[:size], page=page, size=size, total=None, total_exact=False, more=len(rows) > size)
+    total, exact = count_total(query, total_mode)
+    items = query.limit(size).offset(offset).all()
+    if not exact and items:
+        # an estimate must never contradict what the client can see
+        total = max(total, offset + len(items) + (1 if len(items) == size else 0))
+    return Page(items=items, page=page, size=size, total=total, total_exact=exact)
+
+# ---------- keyset (cursor) mode ----------
+def encode_cursor(tag: str, values: list) -> str:
+    raw = json.dumps({"o": tag, "k": values}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str, tag: str, n_keys: int) -> list:
+    """Raise ValueError for tampered cursors or cursors issued for another ordering."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = data["k"]
+        if data.get("o") != tag:
+            raise ValueError("cursor/order mismatch")
+    except ValueError:
+        raise
+    except Exception as exc:
+        raise ValueError("malformed cursor") from exc
+    if not isinstance(values, list) or len(values) != n_keys:
+        raise ValueError("malformed cursor")
+    return values
+
+def _after(keys, values):
+    """(a, b, c) > (x, y, z) expanded so it works on every dialect and mixed directions."""
+    clauses = []
+    for i, (col, desc) in enumerate(keys):
+        eqs = [keys[j][0] == values[j] for j in range(i)]
+        cmp = col < values[i] if desc else col > values[i]
+        clauses.append(and_(*eqs, cmp))
+    return or_(*clauses)
+
+def keyset_paginate(query, keys: list, cursor: str | None, size: int, tag: str = "") -> CursorPage:
+    """
+    keys: [(column, is_desc), ...]; the last key must be unique (normally the PK).
+    Any ORDER BY already on the query is replaced by the key order.
+    """
+    query = query.order_by(None).order_by(*[c.desc() if d else c.asc() for c, d in keys])
+    if cursor:
+        query = query.filter(_after(keys, decode_cursor(cursor, tag, len(keys))))
+    rows = query.limit(size + 1).all()
+    items = rows[:size]
+    next_cursor = None
+    if len(rows) > size:
+        last = items[-1]
+        next_cursor = encode_cursor(tag, [getattr(last, c.key) for c, _ in keys])
+    return CursorPage(items=items, size=size, next_cursor=next_cursor)
 
 def page_to_dict(p: Page, items_json: list) -> dict:
-    return {"items": items_json, "page": p.page, "size": p.size, "total": p.total, "pages": p.pages}
+    return {"items": items_json, "page": p.page, "size": p.size, "total": p.total, "pages": p.pages,
+            "total_exact": p.total_exact, "has_next": p.has_next}
+
+def cursor_page_to_dict(p: CursorPage, items_json: list) -> dict:
+    return {"items": items_json, "size": p.size, "next_cursor": p.next_cursor}
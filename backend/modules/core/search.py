@@ -0,0 +1,180 @@
+# modules/core/search.py
+"""
+Substring search over a few text columns that does not degrade into a
+sequential scan.
+
+- Postgres: `lower(col) LIKE '%q%'` is served by the pg_trgm GIN indexes
+  created in migration a3c9e1f4b2d7, so the filter is left as-is.
+- SQLite/MySQL: an in-process trigram inverted index narrows the match to a
+  candidate id set first; the LIKE is still applied so the index only has to
+  be a superset (stale postings are harmless). It is kept current by ORM
+  events for this worker's writes and by polling `updated_at` for the rest
+  (indexed on every searched table, see migration b9e4c7a2d316).
+
+Results are ranked: exact match > prefix match > substring match.
+"""
+from __future__ import annotations
+
+import threading, time
+from array import array
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, event, func, or_, select
+
+from extensions import db
+from .cache import table_versions
+from .constants import SEARCH_INDEX_REFRESH_SECONDS, SEARCH_MAX_CANDIDATES
+
+_GRAM = 3
+# re-read this far behind the newest updated_at seen, for transactions that commit out of order
+_OVERLAP = timedelta(seconds=60)
+_MIN_STALE_FOR_REBUILD = 10_000  # small indexes aren't worth rebuilding often
+
+
+def _grams(value) -> set[str]:
+    s = str(value).lower() if value is not None else ""
+    return {s[i:i + _GRAM] for i in range(len(s) - _GRAM + 1)}
+
+
+class TrigramIndex:
+    def __init__(self, model, columns: tuple[str, ...]):
+        self.model = model
+        self.columns = columns
+        self.table = model.__table__.name
+        self._postings: dict[str, array] = {}
+        # id -> (hash of indexed values, number of grams posted): postings are append-only, so an
+        # edit leaves the old entries behind; once they outnumber live ones the index is rebuilt
+        self._rows: dict[int, tuple[int, int]] = {}
+        self._live = 0
+        self._stale = 0
+        self._built = False
+        self._watermark: datetime | None = None
+        self._recent: dict[int, datetime] = {}  # rows inside the overlap window, already indexed
+        self._checked_at = 0.0
+        self._checked_version: tuple = ()
+        self._lock = threading.Lock()
+
+    # ---------- maintenance ----------
+    def add(self, _id: int, values) -> None:
+        values = tuple(values)
+        sig = hash(values)
+        old = self._rows.get(_id)
+        if old is not None and old[0] == sig:
+            return  # unchanged (refresh overlap, or an update of other columns)
+        grams = set()
+        for v in values:
+            grams |= _grams(v)
+        for g in grams:
+            self._postings.setdefault(g, array("I")).append(_id)
+        self._rows[_id] = (sig, len(grams))
+        self._live += len(grams)
+        if old is not None:
+            self._live -= old[1]
+            self._stale += old[1]
+
+    def discard(self, _id: int) -> None:
+        old = self._rows.pop(_id, None)
+        if old is not None:
+            self._live -= old[1]
+            self._stale += old[1]
+
+    def _needs_rebuild(self) -> bool:
+        return self._stale > max(self._live, _MIN_STALE_FOR_REBUILD)
+
+    def _reset(self) -> None:
+        self._postings, self._rows = {}, {}
+        self._live = self._stale = 0
+        self._watermark, self._recent = None, {}
+
+    def _load(self) -> None:
+        m = self.model
+        since = (self._watermark - _OVERLAP) if self._watermark else None
+        stmt = select(m.id, m.updated_at, *[getattr(m, c) for c in self.columns])
+        if since is not None:
+            stmt = stmt.where(m.updated_at >= since)
+        for row in db.session.execute(stmt.execution_options(yield_per=5000)):
+            _id, updated = row[0], row[1]
+            if self._recent.get(_id) == updated:
+                continue
+            self.add(_id, row[2:])
+            if self._watermark is None or updated > self._watermark:
+                self._watermark = updated
+            self._recent[_id] = updated
+        if self._watermark is not None:
+            floor = self._watermark - _OVERLAP
+            self._recent = {k: v for k, v in self._recent.items() if v >= floor}
+
+    def ensure_fresh(self) -> None:
+        now = time.monotonic()
+        version = table_versions((self.table,))
+        if (self._built and version == self._checked_version and now - self._checked_at < SEARCH_INDEX_REFRESH_SECONDS
+                and not self._needs_rebuild()):
+            return
+        with self._lock:
+            if self._needs_rebuild():
+                self._reset()
+            self._load()
+            self._built = True
+            self._checked_at, self._checked_version = now, version
+
+    # ---------- lookup ----------
+    def candidates(self, q: str) -> set[int] | None:
+        """Superset of matching ids, or None when the index can't narrow the search."""
+        grams = _grams(q)
+        if not grams:
+            return None
+        self.ensure_fresh()
+        lists = sorted((self._postings.get(g, array("I")) for g in grams), key=len)
+        ids = set(lists[0])
+        for lst in lists[1:]:
+            if not ids:
+                break
+            ids.intersection_update(lst)
+        return ids if len(ids) <= SEARCH_MAX_CANDIDATES else None
+
+
+_indexes: dict[str, TrigramIndex] = {}
+
+
+def register_search(model, columns: tuple[str, ...]) -> None:
+    """Call once per model (module level, after the class body)."""
+    idx = TrigramIndex(model, columns)
+    _indexes[model.__name__] = idx
+
+    @event.listens_for(model, "after_insert")
+    @event.listens_for(model, "after_update")
+    def _index_row(mapper, connection, target):
+        if idx._built:
+            idx.add(target.id, [getattr(target, c) for c in columns])
+
+    @event.listens_for(model, "after_delete")
+    def _unindex_row(mapper, connection, target):
+        if idx._built:
+            idx.discard(target.id)
+
+
+def _like_clause(model, columns, q: str):
+    like = f"%{q.strip().lower()}%"
+    return or_(*[func.lower(getattr(model, c)).like(like) for c in columns])
+
+
+def text_search(model, columns: tuple[str, ...], q: str):
+    """WHERE clause for a case-insensitive substring match on any of `columns`."""
+    clause = _like_clause(model, columns, q)
+    idx = _indexes.get(model.__name__)
+    if idx is None or db.engine.dialect.name == "postgresql":
+        return clause
+    ids = idx.candidates(q.strip())
+    if ids is None:
+        return clause
+    return model.id.in_(sorted(ids)) & clause
+
+
+def search_rank(model, columns: tuple[str, ...], exact_columns: tuple[str, ...], q: str):
+    """3 = exact match on an identifier column, 2 = prefix match, 1 = substring match."""
+    s = q.strip().lower()
+    return case(
+        (or_(*[func.lower(getattr(model, c)) == s for c in exact_columns]), 3),
+        (or_(*[func.lower(getattr(model, c)).like(f"{s}%") for c in columns]), 2),
+        else_=1,
+    )
@@ -0,0 +1,140 @@
+# modules/core/serializers.py
+"""
+Row serializers compiled from marshmallow schemas.
+
+List endpoints select just the schema's columns (`query.with_entities(...)`)
+and get plain Row tuples back: no ORM objects, no identity map, no eager
+loads. A RowSerializer turns those tuples into the same dicts
+`Schema(many=True).dump()` would produce, using a function generated once
+per (schema, field subset):
+
+    def _serialize(r):
+        return {"id": r[0], "dob": None if r[1] is None else _c1(r[1]), ...}
+
+Only plain value fields are supported (Int, Str, Bool, Date, DateTime,
+Decimal, Raw, ...); Nested/Method/Function fields raise at compile time.
+
+`?fields=id,code,...` (parse_fields_arg) narrows both the SELECT list and the
+serializer to the requested subset.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Callable, Iterable
+
+from flask import request
+from marshmallow import Schema, fields
+
+
+def _iso(v) -> str:
+    return v.isoformat()
+
+
+def _decimal_str(v) -> str:
+    return format(v, "f")
+
+
+# converters applied to non-None values; fields not listed are passed through
+def _converter(field: fields.Field) -> Callable | None:
+    if isinstance(field, (fields.Nested, fields.Method, fields.Function, fields.List, fields.Dict)):
+        raise TypeError(f"{type(field).__name__} fields can't be compiled to a row serializer")
+    if isinstance(field, (fields.DateTime, fields.Date)):  # Date subclasses DateTime
+        fmt = field.format
+        if fmt not in (None, "iso", "iso8601"):
+            return lambda v, _f=fmt: v.strftime(_f)
+        return _iso
+    if isinstance(field, fields.Decimal):
+        return _decimal_str if field.as_string else None
+    if isinstance(field, fields.Float):
+        return float
+    return None
+
+
+class RowSerializer:
+    """
+    `attributes`: model attribute names, in the order the row's columns must be selected.
+    `keys`: output keys (data_key or field name), same order.
+    """
+
+    def __init__(self, attributes: tuple[str, ...], keys: tuple[str, ...], fn: Callable):
+        self.attributes = attributes
+        self.keys = keys
+        self._fn = fn
+
+    def columns(self, model, extra: Iterable = ()) -> list:
+        """
+        Columns to select, in row order. `extra` columns (e.g. keyset sort keys)
+        are appended when not already selected; the serializer ignores them.
+        """
+        cols = [getattr(model, a) for a in self.attributes]
+        cols += [c for c in extra if c.key not in self.attributes]
+        return cols
+
+    def __call__(self, row) -> dict:
+        return self._fn(row)
+
+    def many(self, rows: Iterable) -> list[dict]:
+        fn = self._fn
+        return [fn(r) for r in rows]
+
+
+def _dump_names(schema_cls: type[Schema]) -> list[str]:
+    return [n for n, f in schema_cls._declared_fields.items() if not f.load_only]
+
+
+def parse_fields_arg(schema_cls: type[Schema], arg: str = "fields") -> tuple[str, ...] | None:
+    """
+    ?fields=a,b,c -> the requested field names in schema order (so equal subsets
+    share a compiled serializer); None when absent/empty = every field.
+    Raises ValueError naming unknown fields.
+    """
+    raw = (request.args.get(arg) or "").strip()
+    if not raw:
+        return None
+    wanted = {f.strip() for f in raw.split(",") if f.strip()}
+    names = _dump_names(schema_cls)
+    unknown = wanted - set(names)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(n for n in names if n in wanted)
+
+
+def is_row_serializable(schema_cls: type[Schema], only: tuple[str, ...] | None = None) -> bool:
+    """True when every (requested) field can be served from plain column rows."""
+    declared = schema_cls._declared_fields
+    try:
+        for n in (only if only is not None else _dump_names(schema_cls)):
+            _converter(declared[n])
+    except TypeError:
+        return False
+    return True
+
+
+def _compile(attributes, keys, converters) -> Callable:
+    env: dict = {}
+    parts = []
+    for i, (key, conv) in enumerate(zip(keys, converters)):
+        if conv is None:
+            parts.append(f"{key!r}: r[{i}]")
+        else:
+            env[f"_c{i}"] = conv
+            parts.append(f"{key!r}: None if r[{i}] is None else _c{i}(r[{i}])")
+    src = "def _serialize(r):\n    return {" + ", ".join(parts) + "}\n"
+    exec(compile(src, "<row serializer>", "exec"), env)
+    return env["_serialize"]
+
+
+@lru_cache(maxsize=256)
+def row_serializer(schema_cls: type[Schema], only: tuple[str, ...] | None = None) -> RowSerializer:
+    """Cached per (schema, only); `only` keeps the schema's field order."""
+    declared = schema_cls._declared_fields
+    names = _dump_names(schema_cls)
+    if only is not None:
+        unknown = set(only) - set(names)
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+        names = [n for n in names if n in only]
+    attributes = tuple(declared[n].attribute or n for n in names)
+    keys = tuple(declared[n].data_key or n for n in names)
+    converters = [_converter(declared[n]) for n in names]
+    return RowSerializer(attributes, keys, _compile(attributes, keys, converters))
@@ -0,0 +1,298 @@
+# modules/hr/bulk.py
+"""
+Set-based bulk create/upsert/update/delete for employees.
+
+Items are validated one by one, then executed per chunk as a handful of
+statements (grouped by operation and by the set of fields they touch):
+
+  upsert/create with code -> multi-row INSERT ... ON CONFLICT (code) DO UPDATE
+                             (ON DUPLICATE KEY UPDATE on MySQL)
+  create without code     -> ORM insert, so the ARA<id> code hook still runs
+  update                  -> one executemany UPDATE ... WHERE id = :id per field set
+  delete                  -> DELETE ... WHERE id IN (...) (documents first)
+
+Within a chunk, writes run in that order (inserts, updates, deletes).
+The caller owns the transaction: every chunk shares it.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Iterator, List
+
+import sqlalchemy as sa
+from sqlalchemy import bindparam
+
+from extensions import db
+from .models import Employee, EmployeeDocument
+
+BULK_CHUNK = 500
+MAX_BULK_ITEMS = 50_000
+OPS = ("create", "upsert", "update", "delete")
+
+WRITABLE_FIELDS = (
+    "code", "first_name", "last_name", "email", "phone", "position",
+    "branch_id", "hire_date", "termination_date", "is_active",
+    "salary_monthly", "nationality", "dob", "meta",
+)
+_DATE_FIELDS = {"hire_date", "termination_date", "dob"}
+_BOOLEANS = {"true": True, "1": True, "false": False, "0": False}
+
+
+class ItemError(ValueError):
+    pass
+
+
+def _coerce(field: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if field in _DATE_FIELDS:
+        if isinstance(value, date):
+            return value
+        try:
+            return date.fromisoformat(str(value)[:10])
+        except ValueError:
+            raise ItemError(f"{field}: expected YYYY-MM-DD")
+    if field == "salary_monthly":
+        try:
+            return Decimal(str(value))
+        except InvalidOperation:
+            raise ItemError("salary_monthly: expected a number")
+    if field == "branch_id":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ItemError("branch_id: expected an integer")
+    if field == "is_active":
+        if isinstance(value, bool):
+            return value
+        parsed = _BOOLEANS.get(str(value).strip().lower()) if isinstance(value, (str, int)) else None
+        if parsed is None:
+            raise ItemError("is_active: expected true or false")
+        return parsed
+    if field == "meta":
+        return value
+    if field in ("code", "email"):
+        return str(value).strip() or None
+    return str(value)
+
+
+def normalize_item(raw: Any) -> Dict[str, Any]:
+    """-> {"op", "id", "fields"}; raises ItemError with a client-facing message."""
+    if not isinstance(raw, dict):
+        raise ItemError("item must be an object")
+    op = (raw.get("op") or "upsert").lower()
+    if op not in OPS:
+        raise ItemError(f"op must be one of {', '.join(OPS)}")
+    fields = {f: _coerce(f, raw[f]) for f in WRITABLE_FIELDS if f in raw}
+    _id = raw.get("id")
+    if op in ("update", "delete"):
+        try:
+            _id = int(_id)
+        except (TypeError, ValueError):
+            raise ItemError(f"{op} requires an integer id")
+    if op == "update" and not fields:
+        raise ItemError("update has no fields")
+    if op == "upsert" and not fields.get("code"):
+        raise ItemError("upsert requires code")
+    if op in ("create", "upsert"):
+        for f in ("first_name", "last_name"):
+            if not fields.get(f):
+                raise ItemError(f"{f} is required")
+    return {"op": op, "id": _id, "fields": fields}
+
+
+def chunked(items: Iterable[Any], size: int = BULK_CHUNK) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for it in items:
+        chunk.append(it)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _dialect_insert(table):
+    name = db.engine.dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return name, insert(table)
+
+
+def _group_by_keys(entries):
+    groups: Dict[tuple, list] = {}
+    for e in entries:
+        groups.setdefault(tuple(sorted(e["fields"])), []).append(e)
+    return groups
+
+
+def _drop_unique_conflicts(field, entries, results, owner_ok) -> list:
+    """
+    A unique key clash would abort the whole statement (and on MySQL turn an
+    insert into an update of the wrong row), so clashes are reported per item.
+    owner_ok(entry, (id, code)) -> True when the existing holder is the row itself.
+    """
+    table = Employee.__table__
+    values = {e["fields"][field] for e in entries if e["fields"].get(field)}
+    owners = {}
+    if values:
+        owners = {r[0]: (r.id, r.code) for r in db.session.execute(
+            sa.select(table.c[field], table.c.id, table.c.code).where(table.c[field].in_(values)))}
+    seen: set = set()
+    kept = []
+    for e in entries:
+        value = e["fields"].get(field)
+        if value and value in seen:
+            results[e["index"]] = {"status": "error", "error": f"duplicate {field} in request"}
+        elif value and value in owners and not owner_ok(e, owners[value]):
+            results[e["index"]] = {"status": "error", "error": f"{field} already in use"}
+        else:
+            if value:
+                seen.add(value)
+            kept.append(e)
+    return kept
+
+
+def _drop_email_conflicts(entries, results, owner_ok) -> list:
+    return _drop_unique_conflicts("email", entries, results, owner_ok)
+
+
+def _insert_with_code(entries, results) -> None:
+    if not entries:
+        return
+    table = Employee.__table__
+    codes = [e["fields"]["code"] for e in entries]
+    existing = dict(db.session.execute(sa.select(table.c.code, table.c.id).where(table.c.code.in_(codes))).all())
+    seen: set = set()
+    todo = []
+    for e in entries:
+        code = e["fields"]["code"]
+        if code in seen:
+            results[e["index"]] = {"status": "error", "error": "duplicate code in request"}
+        elif e["op"] == "create" and code in existing:
+            results[e["index"]] = {"status": "error", "error": "code already exists"}
+        else:
+            seen.add(code)
+            todo.append(e)
+    todo = _drop_email_conflicts(todo, results, lambda e, owner: owner[1] == e["fields"]["code"])
+
+    now = datetime.utcnow()
+    for keys, group in _group_by_keys(todo).items():
+        # every row of a multi-row VALUES has the same keys; column defaults fill the rest
+        rows = [{**e["fields"], "updated_at": now} for e in group]
+        dialect, stmt = _dialect_insert(table)
+        set_cols = [k for k in keys if k != "code"] + ["updated_at"]
+        stmt = stmt.values(rows)
+        if dialect in ("mysql", "mariadb"):
+            stmt = stmt.on_duplicate_key_update({k: stmt.inserted[k] for k in set_cols})
+        else:
+            stmt = stmt.on_conflict_do_update(index_elements=[table.c.code],
+                                              set_={k: stmt.excluded[k] for k in set_cols})
+        db.session.execute(stmt)
+
+    if todo:
+        ids = dict(db.session.execute(
+            sa.select(table.c.code, table.c.id).where(table.c.code.in_([e["fields"]["code"] for e in todo]))
+        ).all())
+        for e in todo:
+            code = e["fields"]["code"]
+            results[e["index"]] = {"status": "updated" if code in existing else "created", "id": ids.get(code)}
+
+
+def _insert_without_code(entries, results) -> None:
+    entries = _drop_email_conflicts(entries, results, lambda e, owner: False)
+    if not entries:
+        return
+    objs = [Employee(**e["fields"]) for e in entries]
+    db.session.add_all(objs)
+    db.session.flush()
+    for e, obj in zip(entries, objs):
+        results[e["index"]] = {"status": "created", "id": obj.id}
+
+
+def _update(entries, results) -> None:
+    if not entries:
+        return
+    table = Employee.__table__
+    ids = [e["id"] for e in entries]
+    found = set(db.session.execute(sa.select(table.c.id).where(table.c.id.in_(ids))).scalars())
+    todo = []
+    for e in entries:
+        if e["id"] in found:
+            todo.append(e)
+        else:
+            results[e["index"]] = {"status": "error", "error": "not found", "id": e["id"]}
+    todo = _drop_unique_conflicts("code", todo, results, lambda e, owner: owner[0] == e["id"])
+    todo = _drop_email_conflicts(todo, results, lambda e, owner: owner[0] == e["id"])
+    # executemany: one round trip per page of rows with psycopg2's batch executemany mode
+    for keys, group in _group_by_keys(todo).items():
+        stmt = (
+            table.update()
+            .where(table.c.id == bindparam("_id"))
+            .values({k: bindparam(k) for k in keys})
+        )
+        db.session.execute(stmt, [{"_id": e["id"], **e["fields"]} for e in group])
+        for e in group:
+            results[e["index"]] = {"status": "updated", "id": e["id"]}
+
+
+def _delete(entries, results) -> None:
+    if not entries:
+        return
+    table = Employee.__table__
+    ids = list({e["id"] for e in entries})
+    found = set(db.session.execute(sa.select(table.c.id).where(table.c.id.in_(ids))).scalars())
+    if found:
+        # FK cascade isn't enforced everywhere (SQLite), so remove documents explicitly
+        docs = EmployeeDocument.__table__
+        db.session.execute(docs.delete().where(docs.c.employee_id.in_(found)))
+        db.session.execute(table.delete().where(table.c.id.in_(found)))
+    for e in entries:
+        if e["id"] in found:
+            results[e["index"]] = {"status": "deleted", "id": e["id"]}
+        else:
+            results[e["index"]] = {"status": "error", "error": "not found", "id": e["id"]}
+
+
+def apply_chunk(entries: List[Dict[str, Any]], results: Dict[int, dict]) -> None:
+    """entries: normalized items with their request "index"; fills results[index]."""
+    writes = [e for e in entries if e["op"] in ("create", "upsert")]
+    _insert_with_code([e for e in writes if e["fields"].get("code")], results)
+    _insert_without_code([e for e in writes if not e["fields"].get("code")], results)
+    _update([e for e in entries if e["op"] == "update"], results)
+    _delete([e for e in entries if e["op"] == "delete"], results)
+
+
+def run_bulk(raw_items: Iterable[Any]) -> List[dict]:
+    """
+    Validate and apply `raw_items` (dicts, or ItemError for unparsable input)
+    chunk by chunk in the current transaction; returns one result per item,
+    in request order. Raises ItemError when the request is too large.
+    """
+    results: Dict[int, dict] = {}
+    ops: Dict[int, str] = {}
+
+    def entries():
+        for i, raw in enumerate(raw_items):
+            if i >= MAX_BULK_ITEMS:
+                raise ItemError(f"at most {MAX_BULK_ITEMS} items per request")
+            try:
+                if isinstance(raw, ItemError):
+                    raise raw
+                item = normalize_item(raw)
+            except ItemError as exc:
+                results[i] = {"status": "error", "error": str(exc)}
+                ops[i] = raw.get("op") if isinstance(raw, dict) else None
+                continue
+            ops[i] = item["op"]
+            yield {**item, "index": i}
+
+    for chunk in chunked(entries()):
+        apply_chunk(chunk, results)
+
+    return [{"index": i, "op": ops.get(i), **results[i]} for i in sorted(results)]
@@ -0,0 +1,218 @@
+# modules/hr/exports.py
+"""
+Streaming exports. Rows come straight from a server-side cursor as plain
+column tuples (no ORM objects, no identity map), so memory stays flat no
+matter how many employees match.
+"""
+import csv, io, json, re, zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape as xml_escape
+from .models import Employee, EmployeeDocument, DocumentType
+
+EXPORT_BATCH = 1000
+
+# same columns/order as EmployeeOut
+EMPLOYEE_EXPORT_COLUMNS = (
+    "id", "code", "first_name", "last_name", "email", "phone", "position", "branch_id",
+    "is_active", "salary_monthly", "nationality", "dob", "hire_date", "termination_date",
+)
+
+
+def employee_export_rows(q: str | None, branch: str | None, order: str | None = None):
+    """Yields tuples in EMPLOYEE_EXPORT_COLUMNS order, streamed in EXPORT_BATCH-sized fetches."""
+    query = (
+        Employee.list_for_api(q=q, branch=branch, order=order, eager=False)
+        .with_entities(*[getattr(Employee, c) for c in EMPLOYEE_EXPORT_COLUMNS])
+        .yield_per(EXPORT_BATCH)  # implies stream_results (server-side cursor where supported)
+    )
+    for row in query:
+        yield tuple(row)
+
+
+# same columns as doc_to_dict (minus meta_values), plus the codes people actually read
+DOCUMENT_EXPORT_COLUMNS = (
+    "id", "employee_id", "employee_code", "document_type_id", "document_type_code",
+    "file_name", "file_path", "issued_date", "expiry_date", "is_expirable", "is_active",
+    "notifications_muted", "muted_until", "last_reminded_at", "notes",
+)
+
+
+def document_export_rows(employee_id: int | None, document_type_id: int | None, active: int | None):
+    d = EmployeeDocument
+    cols = [
+        d.id, d.employee_id, Employee.code, d.document_type_id, DocumentType.code,
+        d.file_name, d.file_path, d.issued_date, d.expiry_date, d.is_expirable, d.is_active,
+        d.notifications_muted, d.muted_until, d.last_reminded_at, d.notes,
+    ]
+    query = (
+        EmployeeDocument.list_for_api(employee_id, document_type_id, active)
+        .join(Employee, Employee.id == d.employee_id)
+        .join(DocumentType, DocumentType.id == d.document_type_id)
+        .with_entities(*cols)
+        .yield_per(EXPORT_BATCH)
+    )
+    for row in query:
+        yield tuple(row)
+
+
+def _plain(v):
+    if isinstance(v, (date, datetime)):
+        return v.isoformat()
+    if isinstance(v, Decimal):
+        return str(v)
+    return v
+
+
+def iter_csv(columns, rows):
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(columns)
+    n = 0
+    for row in rows:
+        w.writerow(["" if v is None else _plain(v) for v in row])
+        n += 1
+        if n % EXPORT_BATCH == 0:
+            yield buf.getvalue()
+            buf.seek(0); buf.truncate()
+    yield buf.getvalue()
+
+
+def iter_ndjson(columns, rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({c: _plain(v) for c, v in zip(columns, row)}, ensure_ascii=False))
+        if len(lines) == EXPORT_BATCH:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+# ---------- XLSX, streamed ----------
+# A minimal SpreadsheetML package written straight into a zip whose output is
+# handed out as it grows: the sheet XML is compressed row batch by row batch
+# and zipfile falls back to data descriptors on an unseekable sink, so the
+# first bytes leave before the query is done and nothing is buffered to disk.
+
+_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_CONTENT_TYPES = _XML + (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = _XML + (
+    f'<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_RELS = _XML + (
+    f'<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+# cell styles: 0 general, 1 date, 2 date-time
+_STYLES = _XML + (
+    f'<styleSheet xmlns="{_NS}">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_EPOCH = datetime(1899, 12, 30)
+# XML 1.0 has no place for C0 controls other than tab/newline/CR (openpyxl refuses them too)
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_SHEET_NAME_BAD = re.compile(r"[\[\]:*?/\\]")
+
+
+def _col_letter(i: int) -> str:
+    out = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        out = chr(65 + r) + out
+    return out
+
+
+def _xlsx_cell(ref: str, v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, bool):
+        return f'<c r="{ref}" t="b"><v>{int(v)}</v></c>'
+    if isinstance(v, (int, float, Decimal)):
+        return f'<c r="{ref}"><v>{v}</v></c>'
+    if isinstance(v, datetime):
+        serial = (v.replace(tzinfo=None) - _EPOCH).total_seconds() / 86400
+        return f'<c r="{ref}" s="2"><v>{serial!r}</v></c>'
+    if isinstance(v, date):
+        return f'<c r="{ref}" s="1"><v>{(v - _EPOCH.date()).days}</v></c>'
+    text = json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else str(v)
+    text = xml_escape(_ILLEGAL_XML.sub("", text))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class _Sink(io.RawIOBase):
+    """Unseekable zip output that collects what has been written since the last take()."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def take(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def iter_xlsx(columns, rows, title: str = "Sheet1"):
+    """Yields an .xlsx file (one sheet, header row + rows) while the rows are being read."""
+    sink = _Sink()
+    letters = [_col_letter(i) for i in range(len(columns))]
+    name = xml_escape(_SHEET_NAME_BAD.sub("_", title)[:31] or "Sheet1", {'"': "&quot;"})
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _XML + (
+            f'<workbook xmlns="{_NS}" xmlns:r="{_REL_NS}"><sheets>'
+            f'<sheet name="{name}" sheetId="1" r:id="rId1"/></sheets></workbook>'))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _STYLES)
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((_XML + f'<worksheet xmlns="{_NS}"><sheetData>').encode())
+            parts = ['<row r="1">', *(_xlsx_cell(f"{l}1", c) for l, c in zip(letters, columns)), "</row>"]
+            for r, row in enumerate(rows, start=2):
+                parts.append(f'<row r="{r}">')
+                parts.extend(_xlsx_cell(f"{l}{r}", v) for l, v in zip(letters, row))
+                parts.append("</row>")
+                if r % EXPORT_BATCH == 0:
+                    sheet.write("".join(parts).encode("utf-8"))
+                    parts.clear()
+                    yield sink.take()
+            parts.append("</sheetData></worksheet>")
+            sheet.write("".join(parts).encode("utf-8"))
+    yield sink.take()
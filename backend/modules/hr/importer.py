@@ -0,0 +1,271 @@
+# modules/hr/importer.py
+"""
+Employee import helpers shared by the Excel seed (seeds/seed_employees_from_excel.py)
+and the HTTP import endpoint: raw-row -> employee dict transform, and a
+dialect-aware multi-row "insert, ignore duplicates".
+"""
+from __future__ import annotations
+import math
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional, Iterator
+
+import sqlalchemy as sa
+from extensions import db
+from .models import Employee
+
+# ---------- helpers ----------
+def _first_nonempty(d: Dict[str, Any], keys: List[str], default: str = "") -> str:
+    for k in keys:
+        v = d.get(k)
+        if v is None:
+            continue
+        s = str(v).strip()
+        if s:
+            return s
+    return default
+
+def _to_float(v: Any) -> float:
+    try:
+        if v is None or (isinstance(v, float) and (math.isnan(v) or math.isinf(v))):
+            return 0.0
+        return float(str(v).strip().replace(",", ""))
+    except Exception:
+        return 0.0
+
+def _to_date(v: Any):
+    # very tolerant date parser; pandas/openpyxl usually give datetime already
+    if isinstance(v, datetime):
+        return v.date()
+    if isinstance(v, date):
+        return v
+    if isinstance(v, str):
+        # str(datetime) as produced by _first_nonempty; works without pandas
+        try:
+            return datetime.fromisoformat(v.strip()).date()
+        except ValueError:
+            pass
+    try:
+        import pandas as pd  # type: ignore
+        if isinstance(v, (str, bytes)):
+            s = str(v).strip()
+            if not s:
+                return None
+            return pd.to_datetime(s, errors="coerce").date()
+        elif hasattr(v, "date"):
+            return v.date()
+        return None
+    except Exception:
+        return None
+
+def _json_safe(v: Any) -> Any:
+    # meta is a JSON column: dates -> ISO strings, NaN -> None
+    if isinstance(v, (date, datetime)):
+        return v.isoformat()
+    if isinstance(v, float) and (math.isnan(v) or math.isinf(v)):
+        return None
+    return v
+
+# Build one employee dict from a raw Excel row
+def transform_row(r: Dict[str, Any], idx: int, branch_by_code: dict[str,int], branch_by_name: dict[str,int]) -> Dict[str, Any]:
+    code  = _first_nonempty(r, ["code", "emp_code", "employee code", "employee_code"], f"E{idx:04d}")
+    email = _first_nonempty(r, ["email", "mail"], f"emp{idx}@example.com").lower()
+
+    first = _first_nonempty(r, ["first_name", "first", "given name", "name_en", "name"], "")
+    last  = _first_nonempty(r, ["last_name", "last", "surname"], "")
+    if not first:
+        full = _first_nonempty(r, ["employee name", "employee_name"], "")
+        if full:
+            parts = full.split()
+            first = parts[0] if parts else f"Emp{idx}"
+            last  = " ".join(parts[1:]) if len(parts) > 1 else ""
+
+    phone = _first_nonempty(r, ["phone", "mobile", "contact", "phone no", "mobile no"], "")
+    position = _first_nonempty(r, ["position", "designation", "profession", "trade", "job title"], "")
+    nationality = _first_nonempty(r, ["nationality", "country"], "")
+    dob = _to_date(_first_nonempty(r, ["dob", "date of birth", "birth date"], ""))
+
+    # salary × 0.317
+    salary_raw = _to_float(_first_nonempty(r, ["salary", "monthly_salary", "basic", "base", "wage"], "0"))
+    salary_monthly = round(salary_raw * 0.317, 2)
+
+    # branch resolve
+    branch_str = _first_nonempty(r, ["branch", "site", "location", "office"], "")
+    branch_id: Optional[int] = None
+    if branch_str:
+        key = branch_str.strip().lower()
+        branch_id = branch_by_code.get(key) or branch_by_name.get(key)
+
+    # Collect everything else into meta (raw snapshot)
+    known_keys = {
+        "code","emp_code","employee code","employee_code",
+        "email","mail",
+        "first_name","first","given name","name_en","name","employee name","employee_name",
+        "last_name","last","surname",
+        "phone","mobile","contact","phone no","mobile no",
+        "position","designation","profession","trade","job title",
+        "nationality","country",
+        "dob","date of birth","birth date",
+        "salary","monthly_salary","basic","base","wage",
+        "branch","site","location", "office",
+    }
+    meta = {k: _json_safe(v) for k, v in r.items() if k not in known_keys}
+
+    out = dict(
+        code=code,
+        first_name=first or f"Emp{idx}",
+        last_name=last or "",
+        email=email,
+        phone=phone or None,
+        position=position or None,
+        branch_id=branch_id,
+        hire_date=None,              # we will fill when/if we know which header carries it
+        termination_date=None,
+        is_active=True,
+        salary_monthly=salary_monthly,
+        nationality=nationality or None,
+        dob=dob,
+        meta=meta or None,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+    )
+    return out
+
+# constrain to real table columns (safe across DBs)
+def _filter_to_table_columns(row: Dict[str, Any], table: sa.Table) -> Dict[str, Any]:
+    cols = {c.name for c in table.c}
+    return {k: v for k, v in row.items() if k in cols}
+
+def bulk_insert_employees(rows: List[Dict[str, Any]]) -> int:
+    if not rows:
+        return 0
+    table = sa.inspect(Employee).local_table
+    filtered = [_filter_to_table_columns(r, table) for r in rows]
+    filtered = [r for r in filtered if r.get("code") or r.get("email")]
+    if not filtered:
+        return 0
+
+    dialect = db.engine.dialect.name
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as psql_insert
+        # no conflict target: skip rows that clash on any unique constraint (code or email),
+        # like INSERT IGNORE / OR IGNORE below
+        stmt = psql_insert(table).values(filtered).on_conflict_do_nothing()
+        res = db.session.execute(stmt)
+        return res.rowcount or 0
+    elif dialect in {"mysql", "mariadb"}:
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table).values(filtered).prefix_with("IGNORE")
+        res = db.session.execute(stmt)
+        return res.rowcount or 0
+    else:
+        stmt = sa.insert(table).values(filtered).prefix_with("OR IGNORE")
+        res = db.session.execute(stmt)
+        return res.rowcount or 0
+
+# ---------- streaming workbook reader ----------
+def iter_xlsx_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one dict per data row (header keys stripped/lowercased, like the seed's
+    reader) from a read-only workbook, so rows are parsed lazily from the file.
+    """
+    try:
+        from openpyxl import load_workbook  # type: ignore
+    except Exception:
+        raise RuntimeError("Please install openpyxl to read Excel files.")
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        headers = [str(c).strip().lower() if c is not None else "" for c in header]
+        for values in rows:
+            if values is None or all(v is None for v in values):
+                continue
+            yield {(headers[i] if i < len(headers) else f"col{i}"): v for i, v in enumerate(values)}
+    finally:
+        wb.close()
+
+
+# ---------- chunked import (HTTP endpoint job) ----------
+IMPORT_BATCH = 1000
+MAX_REPORTED_ERRORS = 500
+
+
+def _xlsx_data_rows(path: str) -> Optional[int]:
+    """Row count from the sheet's dimension record (no full read); None if absent."""
+    from openpyxl import load_workbook  # type: ignore
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        max_row = wb.active.max_row
+        return max(max_row - 1, 0) if max_row else None
+    finally:
+        wb.close()
+
+
+def import_employees_xlsx(job, path: str, batch_size: int = IMPORT_BATCH) -> None:
+    """
+    Stream the workbook, transform and insert in fixed-size batches, committing
+    each batch together with the job's progress counters. Bad rows are reported
+    per row; a batch the DB rejects is retried row by row (one savepoint each)
+    to report the rows at fault.
+    """
+    from modules.core.models import Branch
+
+    branches = Branch.query.all()
+    branch_by_code = {(b.code or "").strip().lower(): b.id for b in branches if b.code}
+    branch_by_name = {(b.name or "").strip().lower(): b.id for b in branches if b.name}
+
+    job.total = _xlsx_data_rows(path)
+    db.session.commit()
+
+    errors: List[Dict[str, Any]] = []
+    counts = {"processed": 0, "succeeded": 0, "skipped": 0, "failed": 0}
+    batch: List[Dict[str, Any]] = []
+    batch_rows: List[int] = []  # spreadsheet row of each batch entry
+
+    def report(entry: Dict[str, Any]) -> None:
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(entry)
+
+    def insert_rows_one_by_one() -> None:
+        # the batch was rejected: find the offending rows, each in its own savepoint
+        for row_no, row in zip(batch_rows, batch):
+            try:
+                with db.session.begin_nested():
+                    inserted = bulk_insert_employees([row])
+                counts["succeeded"] += inserted
+                counts["skipped"] += 1 - inserted
+            except Exception as exc:
+                counts["failed"] += 1
+                report({"row": row_no, "error": str(getattr(exc, "orig", exc))[:500]})
+
+    def flush() -> None:
+        # counters are kept locally and copied onto the job, so a rolled-back batch can't lose them
+        nonlocal batch, batch_rows
+        n = len(batch)
+        try:
+            inserted = bulk_insert_employees(batch)
+            counts["succeeded"] += inserted
+            counts["skipped"] += n - inserted  # duplicates by code/email
+        except Exception:
+            db.session.rollback()
+            insert_rows_one_by_one()
+        counts["processed"] += n
+        for k, v in counts.items():
+            setattr(job, k, v)
+        job.errors = list(errors)  # new list so the JSON column is marked dirty
+        db.session.commit()
+        batch, batch_rows = [], []
+
+    for idx, raw in enumerate(iter_xlsx_rows(path), start=1):
+        row_no = idx + 1  # spreadsheet row (header is row 1)
+        try:
+            batch.append(transform_row(raw, idx, branch_by_code, branch_by_name))
+            batch_rows.append(row_no)
+        except Exception as exc:
+            counts["failed"] += 1
+            counts["processed"] += 1
+            report({"row": row_no, "error": str(exc)[:500]})
+        if len(batch) >= batch_size:
+            flush()
+    flush()
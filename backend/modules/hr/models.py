@@ -5,6 +5,7 @@ from sqlalchemy.orm import relationship, backref, joinedload
 from extensions import db
 from modules.core.models import Branch
 from modules.core.model_mixins import QueryHelperMixin
+from modules.core.search import register_search, text_search, search_rank
 
 JSONType = db.JSON  # switch to JSONB on Postgres if you like
 
@@ -20,6 +21,7 @@ class Employee(db.Model, QueryHelperMixin, TimestampMixin):
         UniqueConstraint("code", name="uq_employee_code"),
         UniqueConstraint("email", name="uq_employee_email"),
         Index("ix_employee_branch", "branch_id"),
+        Index("ix_employees_updated_at", "updated_at"),  # search index refresh polls by updated_at
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -63,18 +65,16 @@ class Employee(db.Model, QueryHelperMixin, TimestampMixin):
         # preload branch to avoid N+1 when needed
         return [joinedload(cls.branch)]
 
+    # substring-searched columns (pg_trgm GIN indexes on Postgres, see modules.core.search)
+    SEARCH_COLUMNS = ("code", "first_name", "last_name", "email")
+
     @classmethod
-    def search(cls, q: str | None):
-        base = cls.base_query()
-        if not q:
+    def search(cls, q: str | None, eager: bool = True):
+        # eager=False for column-only queries (with_entities) that can't take loader options
+        base = cls.base_query() if eager else cls.query
+        if not q or not q.strip():
             return base
-        like = f"%{q.strip().lower()}%"
-        return base.filter(or_(
-            func.lower(cls.code).like(like),
-            func.lower(cls.first_name).like(like),
-            func.lower(cls.last_name).like(like),
-            func.lower(cls.email).like(like),
-        ))
+        return base.filter(text_search(cls, cls.SEARCH_COLUMNS, q))
 
     @classmethod
     def _apply_branch(cls, query, branch: str | None):
@@ -86,17 +86,26 @@ class Employee(db.Model, QueryHelperMixin, TimestampMixin):
         return query.join(Branch, isouter=True).filter(func.lower(Branch.code) == branch.lower())
 
     @classmethod
-    def list_for_api(cls, q: str | None, branch: str | None, order: str | None = None):
-        qry = cls.search(q)
-        qry = cls._apply_branch(qry, branch)
-        # default newest first
+    def sort_keys(cls, order: str | None) -> list:
+        """[(column, is_desc)] for ?order; id is the unique tie-breaker (keyset-safe)."""
         if order == "name_asc":
-            qry = qry.order_by(cls.first_name.asc(), cls.last_name.asc())
-        elif order == "name_desc":
-            qry = qry.order_by(cls.first_name.desc(), cls.last_name.desc())
-        else:
-            qry = qry.order_by(cls.id.desc())
-        return qry
+            return [(cls.first_name, False), (cls.last_name, False), (cls.id, False)]
+        if order == "name_desc":
+            return [(cls.first_name, True), (cls.last_name, True), (cls.id, True)]
+        # default newest first
+        return [(cls.id, True)]
+
+    @classmethod
+    def list_for_api(cls, q: str | None, branch: str | None, order: str | None = None, eager: bool = True):
+        qry = cls.search(q, eager=eager)
+        qry = cls._apply_branch(qry, branch)
+        if q and q.strip() and not order:
+            # no explicit order while searching: best matches first
+            qry = qry.order_by(search_rank(cls, cls.SEARCH_COLUMNS, ("code", "email"), q).desc())
+        return qry.order_by(*[c.desc() if d else c.asc() for c, d in cls.sort_keys(order)])
+
+
+register_search(Employee, Employee.SEARCH_COLUMNS)
 
 
 @event.listens_for(Employee, "after_insert")
@@ -158,5 +167,23 @@ class EmployeeDocument(db.Model, TimestampMixin):
     employee      = relationship(Employee, backref=backref("documents", lazy="dynamic", cascade="all, delete-orphan"))
     document_type = relationship(DocumentType)
 
+    @classmethod
+    def list_for_api(cls, employee_id: int | None, document_type_id: int | None, active: int | None):
+        qry = cls.query
+        if employee_id:
+            qry = qry.filter_by(employee_id=employee_id)
+        if document_type_id:
+            qry = qry.filter_by(document_type_id=document_type_id)
+        if active is not None:
+            qry = qry.filter_by(is_active=bool(active))
+        return qry.order_by(cls.id.desc())
+
     def __repr__(self):
         return f"<EmployeeDocument emp={self.employee_id} type={self.document_type_id} active={self.is_active}>"
+
+
+@event.listens_for(EmployeeDocument.expiry_date, "set")
+def _empdoc_expiry_changed(target, value, oldvalue, initiator):
+    # a renewed document starts a new reminder cycle (see modules.hr.reminders)
+    if isinstance(oldvalue, date) and str(value) != str(oldvalue):
+        target.last_reminded_at = None
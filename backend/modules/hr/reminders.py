@@ -0,0 +1,115 @@
+# modules/hr/reminders.py
+"""
+Document expiry reminders -> `notifications` rows (broadcast, user_id NULL).
+
+A document is due when its type is active and has remind_before_days, the
+document is active, expirable and not muted (notifications_muted, or
+muted_until today or later), its expiry_date falls within remind_before_days
+of today (or is already past), and either it was never reminded or
+remind_every_days have passed since last_reminded_at (day granularity, so a
+daily run a few seconds early still counts). Types without remind_every_days
+remind once per expiry date: changing expiry_date clears last_reminded_at.
+
+Per document type the cut-offs are constants, so the expiry_date range goes
+to ix_empdoc_expiry. Due ids are taken in keyset batches; each batch is
+claimed by one UPDATE of last_reminded_at that repeats the due condition,
+then one INSERT ... SELECT into notifications for the rows stamped with this
+run's timestamp, committed together. Runs may overlap (the daily job and
+POST /documents/reminders): the UPDATE of the later one waits for the row
+locks and re-checks the condition, so each reminder is sent once. A failed
+batch is rolled back and picked up again. "Today" is the UTC date, like
+last_reminded_at.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Callable
+
+from sqlalchemy import String, and_, case, cast, func, literal, null, or_, select
+
+from extensions import db
+from modules.core.models import Notification
+from .models import DocumentType, Employee, EmployeeDocument
+
+REMINDER_BATCH = 5_000
+NOTIFICATION_TYPE = "doc_expiry"
+
+
+def _due(dt: DocumentType, today: date):
+    D = EmployeeDocument
+    conds = [
+        D.document_type_id == dt.id,
+        D.expiry_date.isnot(None),
+        D.expiry_date <= today + timedelta(days=dt.remind_before_days),
+        D.is_active.is_(True),
+        D.is_expirable.is_(True),
+        D.notifications_muted.is_(False),
+        or_(D.muted_until.is_(None), D.muted_until < today),
+    ]
+    if dt.remind_every_days:
+        since = datetime.combine(today - timedelta(days=dt.remind_every_days - 1), time.min)
+        conds.append(or_(D.last_reminded_at.is_(None), D.last_reminded_at < since))
+    else:
+        conds.append(D.last_reminded_at.is_(None))
+    return and_(*conds)
+
+
+def _notifications_from(dt: DocumentType, ids: list[int], today: date, now: datetime):
+    # only rows this run claimed (stamped with its `now`)
+    D, E = EmployeeDocument, Employee
+    who = func.coalesce(E.code, "") + " " + E.first_name + " " + E.last_name
+    return Notification.__table__.insert().from_select(
+        ["created_at", "updated_at", "user_id", "type", "severity", "title", "body",
+         "object_table", "object_id", "sent_email"],
+        select(
+            literal(now), literal(now), null(), literal(NOTIFICATION_TYPE),
+            case((D.expiry_date < today, "critical"), else_="warning"),
+            func.substr(literal(f"{dt.name_en}: ") + who, 1, 200),
+            literal("Expiry date: ") + cast(D.expiry_date, String),
+            literal(EmployeeDocument.__tablename__), D.id, literal(False),
+        ).join(E, E.id == D.employee_id).where(D.id.in_(ids), D.last_reminded_at == now),
+    )
+
+
+def send_document_reminders(today: date | None = None, batch_size: int = REMINDER_BATCH,
+                            progress: Callable[[int], None] | None = None) -> dict:
+    """
+    Create the reminders due on `today` (default: today, UTC). Returns
+    {"types": n, "notified": n}; `progress(notified_so_far)` runs after each commit.
+    """
+    now = datetime.utcnow()
+    today = today or now.date()
+    D = EmployeeDocument
+    types = (DocumentType.query
+             .filter(DocumentType.is_active.is_(True), DocumentType.remind_before_days.isnot(None))
+             .all())
+    notified = 0
+    for dt in types:
+        due = _due(dt, today)
+        last_id = 0
+        while True:
+            ids = [r[0] for r in db.session.query(D.id).filter(due, D.id > last_id).order_by(D.id).limit(batch_size)]
+            if not ids:
+                break
+            last_id = ids[-1]
+            claimed = db.session.execute(
+                D.__table__.update().where(D.id.in_(ids), due).values(last_reminded_at=now)
+            ).rowcount
+            if claimed:
+                db.session.execute(_notifications_from(dt, ids, today, now))
+            db.session.commit()
+            notified += claimed
+            if progress:
+                progress(notified)
+    return {"types": len(types), "notified": notified}
+
+
+def run_reminders_job(job) -> None:
+    """BackgroundJob target (see modules.core.jobs.start_job)."""
+    def progress(n: int) -> None:
+        job.processed = job.succeeded = n
+        db.session.commit()
+
+    result = send_document_reminders(progress=progress)
+    job.processed = job.succeeded = result["notified"]
+    job.message = f"{result['notified']} reminders over {result['types']} document types"
@@ -1,12 +1,27 @@
 # modules/hr/routes.py
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
+import json, os, tempfile
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy.exc import IntegrityError
 from extensions import db
 from .models import Employee, DocumentType, EmployeeDocument
 from .utils import employee_to_dict, doctype_to_dict, doc_to_dict
-from .schemas import EmployeeOut, EmployeeListOut
+from .exports import (
+    EMPLOYEE_EXPORT_COLUMNS, DOCUMENT_EXPORT_COLUMNS, employee_export_rows, document_export_rows,
+    iter_csv, iter_ndjson, iter_xlsx,
+)
+from .schemas import EmployeeOut, EmployeeListOut, EmployeeDocumentOut
 from ..auth.permissions import permission_required
-from modules.core.pagination import parse_pagination_args, paginate, page_to_dict
+from common.utils.conditional import conditional, max_updated
+from modules.core.jobs import start_job
+from modules.core.serializers import row_serializer, parse_fields_arg
+from modules.core.models import BackgroundJob
+from .importer import import_employees_xlsx
+from .reminders import send_document_reminders, run_reminders_job
+from . import bulk
+from modules.core.pagination import (
+    parse_pagination_args, parse_cursor_arg, parse_total_mode, paginate, keyset_paginate, page_to_dict, cursor_page_to_dict,
+)
 
 bp = Blueprint("hr", __name__)
 
@@ -22,19 +37,118 @@ def list_employees():
       page: 1-based (default 1)
       size: page size (default 50, max from core.constants)
       order: name_asc | name_desc | (default newest)
+      cursor: keyset mode; send empty for the first page, then the returned next_cursor
+              (no total/pages in this mode, cost is flat however deep you go)
+      total: exact (default) | estimate | none; see total_exact in the response
+      fields: comma-separated EmployeeOut fields to return (default: all); only these are selected
     """
     page, size = parse_pagination_args()
+    cursor = parse_cursor_arg()
     q = (request.args.get("q") or "").strip()
     branch = (request.args.get("branch") or "").strip()
     order = (request.args.get("order") or "").strip() or None
+    try:
+        only = parse_fields_arg(EmployeeOut)
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
 
-    query = Employee.list_for_api(q=q, branch=branch, order=order)
-    p = paginate(query, page, size)
-    data = EmployeeOut(many=True).dump(p.items)
+    # column rows + compiled serializer: same output as EmployeeOut(many=True, only=...).dump()
+    ser = row_serializer(EmployeeOut, only)
+    keys = Employee.sort_keys(order)
+    cols = ser.columns(Employee, extra=[c for c, _ in keys] if cursor is not None else ())
+    query = Employee.list_for_api(q=q, branch=branch, order=order, eager=False).with_entities(*cols)
+    if cursor is not None:
+        try:
+            cp = keyset_paginate(query, keys, cursor, size, tag=order or "newest")
+        except ValueError:
+            return jsonify({"message": "Invalid cursor"}), 400
+        return jsonify(cursor_page_to_dict(cp, ser.many(cp.items))), 200
+    p = paginate(query, page, size, total_mode=parse_total_mode())
+    data = ser.many(p.items)
     # keep old keys + pages for consistency
     return jsonify({**page_to_dict(p, data)}), 200
 
 
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _export_response(name: str, fmt: str, columns, rows):
+    if fmt == "csv":
+        body = iter_csv(columns, rows)
+    elif fmt == "ndjson":
+        body = iter_ndjson(columns, rows)
+    elif fmt == "xlsx":
+        body = iter_xlsx(columns, rows, title=name)
+    else:
+        return jsonify({"message": "Unsupported format"}), 400
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@bp.get("/employees/export")
+@jwt_required()
+# @permission_required("api:hr:employees:read")
+def export_employees():
+    """
+    Streams every employee matching the list filters.
+      format: csv (default) | ndjson | xlsx
+      q, branch, order: same as GET /employees
+    """
+    fmt = (request.args.get("format") or "csv").strip().lower()
+    q = (request.args.get("q") or "").strip()
+    branch = (request.args.get("branch") or "").strip()
+    order = (request.args.get("order") or "").strip() or None
+    rows = employee_export_rows(q=q, branch=branch, order=order)
+    return _export_response("employees", fmt, EMPLOYEE_EXPORT_COLUMNS, rows)
+
+
+@bp.post("/employees/import")
+@jwt_required()
+# @permission_required("api:hr:employees:create")
+def import_employees():
+    """
+    multipart/form-data with `file` (.xlsx, same headers as the Labor List seed).
+    Returns 202 + job; poll GET /import-jobs/<id> for progress and per-row errors.
+    """
+    f = request.files.get("file")
+    if not f or not f.filename:
+        return jsonify({"message": "file is required"}), 400
+    fd, path = tempfile.mkstemp(suffix=".xlsx", prefix="emp-import-")
+    os.close(fd)
+    f.save(path)
+
+    def run(job):
+        try:
+            import_employees_xlsx(job, path)
+        finally:
+            os.unlink(path)
+
+    uid = get_jwt_identity()
+    job = start_job("hr.employees.import", run, created_by=int(uid) if uid else None)
+    return jsonify({"job": job.to_dict()}), 202
+
+
+@bp.get("/import-jobs/<string:job_id>")
+@jwt_required()
+def get_import_job(job_id: str):
+    """Only the user who started the job (or a superuser) sees it; errors carry row data."""
+    job = db.session.get(BackgroundJob, job_id)
+    if not job or not job.kind.startswith("hr."):
+        return jsonify({"message": "Not found"}), 404
+    claims = get_jwt() or {}
+    is_superuser = claims.get("role") == "superuser" or bool(claims.get("is_superuser"))
+    if not is_superuser and str(job.created_by) != str(get_jwt_identity()):
+        return jsonify({"message": "Not found"}), 404  # don't confirm that the id exists
+    return jsonify(job.to_dict()), 200
+
+
 @bp.post("/employees")
 @jwt_required()
 # @permission_required("api:hr:employees:create")
@@ -60,12 +174,29 @@ def create_employee():
     return EmployeeOut().dump(e), 201
 
 
+def _employee_validator(eid: int):
+    row = db.session.query(Employee.updated_at).filter(Employee.id == eid).first()
+    return (row[0], eid) if row else None
+
+
 @bp.get("/employees/<int:eid>")
 @jwt_required()
 # @permission_required("api:hr:employees:read")
+@conditional(_employee_validator)
 def get_employee(eid: int):
-    e = Employee.query.get_or_404(eid)
-    return EmployeeOut().dump(e), 200
+    """fields: comma-separated EmployeeOut fields to return (default: all)."""
+    try:
+        only = parse_fields_arg(EmployeeOut)
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+    if only is None:
+        e = Employee.query.get_or_404(eid)
+        return EmployeeOut().dump(e), 200
+    ser = row_serializer(EmployeeOut, only)
+    row = db.session.query(*ser.columns(Employee)).filter(Employee.id == eid).first()
+    if row is None:
+        return jsonify({"message": "Not found"}), 404
+    return ser(row), 200
 
 
 @bp.patch("/employees/<int:eid>")
@@ -94,10 +225,64 @@ def delete_employee(eid: int):
     return {"deleted": True}, 200
 
 
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def _ndjson_items(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield bulk.ItemError("invalid JSON line")
+
+
+@bp.post("/employees/bulk")
+@jwt_required()
+# @permission_required("api:hr:employees:update")
+def bulk_employees():
+    """
+    Body: JSON array (or {"items": [...]}) or NDJSON, one item per line:
+      {"op": "create"|"upsert"|"update"|"delete", "id": ..., <employee fields>}
+    op defaults to upsert (matched on code). Everything runs in one transaction;
+    ?atomic=1 rolls it back if any item fails, otherwise the valid items commit.
+    """
+    atomic = request.args.get("atomic", "").lower() in ("1", "true", "yes")
+    if request.mimetype in NDJSON_TYPES:
+        items = _ndjson_items(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        items = data.get("items") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return jsonify({"message": "Expected a JSON array or NDJSON body"}), 400
+
+    try:
+        results = bulk.run_bulk(items)
+    except bulk.ItemError as exc:
+        db.session.rollback()
+        return jsonify({"message": str(exc)}), 413
+    except IntegrityError as exc:
+        db.session.rollback()
+        return jsonify({"message": "Conflict", "detail": str(exc.orig)}), 409
+
+    summary = {"created": 0, "updated": 0, "deleted": 0, "error": 0}
+    for r in results:
+        summary[r["status"]] += 1
+    committed = not (atomic and summary["error"])
+    if committed:
+        db.session.commit()
+    else:
+        db.session.rollback()
+    return jsonify({"committed": committed, "summary": summary, "results": results}), 200
+
+
 # --------- Document Types ---------
 @bp.get("/document-types")
 @jwt_required()
 # @permission_required("api:hr:documents:read")
+@conditional(lambda: max_updated(DocumentType))
 def list_document_types():
     items = DocumentType.query.order_by(DocumentType.name_en.asc()).all()
     return jsonify([doctype_to_dict(t) for t in items]), 200
@@ -129,18 +314,52 @@ def create_document_type():
 @jwt_required()
 # @permission_required("api:hr:documents:read")
 def list_documents():
+    """employee_id, document_type_id, active (1|0) filters; fields: EmployeeDocumentOut subset."""
     eid = request.args.get("employee_id", type=int)
     dtype = request.args.get("document_type_id", type=int)
     active = request.args.get("active", type=int)  # 1 or 0
-    qry = EmployeeDocument.query
-    if eid:
-        qry = qry.filter_by(employee_id=eid)
-    if dtype:
-        qry = qry.filter_by(document_type_id=dtype)
-    if active is not None:
-        qry = qry.filter_by(is_active=bool(active))
-    items = qry.order_by(EmployeeDocument.id.desc()).limit(200).all()
-    return jsonify([doc_to_dict(d) for d in items]), 200
+    try:
+        only = parse_fields_arg(EmployeeDocumentOut)
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+    ser = row_serializer(EmployeeDocumentOut, only)
+    rows = EmployeeDocument.list_for_api(eid, dtype, active).with_entities(*ser.columns(EmployeeDocument)).limit(200)
+    return jsonify(ser.many(rows)), 200
+
+
+@bp.get("/documents/export")
+@jwt_required()
+# @permission_required("api:hr:documents:read")
+def export_documents():
+    """
+    Streams every document matching the list filters (no 200-row cap).
+      format: xlsx (default) | csv | ndjson
+      employee_id, document_type_id, active: same as GET /documents
+    """
+    fmt = (request.args.get("format") or "xlsx").strip().lower()
+    rows = document_export_rows(
+        request.args.get("employee_id", type=int),
+        request.args.get("document_type_id", type=int),
+        request.args.get("active", type=int),
+    )
+    return _export_response("documents", fmt, DOCUMENT_EXPORT_COLUMNS, rows)
+
+
+@bp.post("/documents/reminders")
+@jwt_required()
+# @permission_required("api:hr:documents:update")
+def run_document_reminders():
+    """Starts the expiry reminder run as a job; poll GET /import-jobs/<id>. Cron: `flask hr send-reminders`."""
+    uid = get_jwt_identity()
+    job = start_job("hr.documents.reminders", run_reminders_job, created_by=int(uid) if uid else None)
+    return jsonify({"job": job.to_dict()}), 202
+
+
+@bp.cli.command("send-reminders")
+def send_reminders_command():
+    """Create notifications for documents whose expiry reminder is due."""
+    result = send_document_reminders()
+    print(f"{result['notified']} reminders over {result['types']} document types")
 
 
 @bp.post("/documents")
@@ -23,3 +23,22 @@ class EmployeeListOut(Schema):
     page = fields.Int()
     size = fields.Int()
     pages = fields.Int()
+
+class EmployeeDocumentOut(Schema):
+    # same shape as utils.doc_to_dict
+    id = fields.Int()
+    employee_id = fields.Int()
+    document_type_id = fields.Int()
+    file_name = fields.Str(allow_none=True)
+    file_path = fields.Str(allow_none=True)
+    issued_date = fields.Date(allow_none=True)
+    expiry_date = fields.Date(allow_none=True)
+    is_expirable = fields.Bool()
+    is_active = fields.Bool()
+    notifications_muted = fields.Bool()
+    muted_until = fields.Date(allow_none=True)
+    last_reminded_at = fields.DateTime(allow_none=True)
+    notes = fields.Str(allow_none=True)
+    meta_values = fields.Raw(allow_none=True)
+    created_at = fields.DateTime(allow_none=True)
+    updated_at = fields.DateTime(allow_none=True)
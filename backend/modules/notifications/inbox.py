@@ -0,0 +1,149 @@
+# modules/notifications/inbox.py
+"""
+Notification inbox for one user: their own rows (user_id = me) plus
+broadcasts (user_id IS NULL).
+
+Read state:
+  own        -> notifications.read_at
+  broadcast  -> read when id <= notification_inboxes.read_through (mark-all-read)
+                or a notification_reads row exists (single mark-read)
+
+A broadcast costs no per-user rows until someone marks it read on its own,
+and mark-all-read folds those rows back into the watermark. New users get
+their inbox row with read_through at the newest notification, so the
+backlog of old broadcasts doesn't land on them as unread.
+
+Unread counts are cached per user and depend on two versions: the user's
+own (bumped by mark_read/mark_all_read) and NEW_NOTIFICATIONS (any insert or
+delete of notifications). Reading your inbox doesn't invalidate anyone
+else's count. This worker's writes invalidate at once, other workers'
+within NOTIFICATION_COUNT_TTL.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import and_, case, delete, event, func, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from modules.core.cache import VersionedCache, bump_tables, watch_column
+from modules.core.constants import NOTIFICATION_COUNT_TTL
+from modules.core.models import Notification, NotificationInbox, NotificationRead
+from modules.core.serializers import RowSerializer
+from modules.users.models import User
+
+N, R = Notification, NotificationRead
+
+NEW_NOTIFICATIONS = "notifications.user_id"
+watch_column("notifications", "user_id", NEW_NOTIFICATIONS)
+
+_unread_cache = VersionedCache("notification_unread", maxsize=10_000, ttl=NOTIFICATION_COUNT_TTL)
+
+
+def _user_version(user_id: int) -> str:
+    return f"notification_inbox:{user_id}"
+
+
+@event.listens_for(User, "after_insert")
+def _user_inbox(mapper, connection, target: User):
+    now = datetime.utcnow()
+    connection.execute(NotificationInbox.__table__.insert().from_select(
+        ["user_id", "read_through", "updated_at"],
+        select(literal(target.id), func.coalesce(func.max(N.id), 0), literal(now)),
+    ))
+
+
+def read_through(user_id: int) -> int:
+    return db.session.query(NotificationInbox.read_through).filter_by(user_id=user_id).scalar() or 0
+
+
+def _base(user_id: int):
+    return (db.session.query(N)
+            .outerjoin(R, and_(R.notification_id == N.id, R.user_id == user_id))
+            .filter(or_(N.user_id == user_id, N.user_id.is_(None))))
+
+
+def _unread(user_id: int, through: int):
+    return and_(
+        N.read_at.is_(None),
+        R.notification_id.is_(None),
+        or_(N.user_id == user_id, N.id > through),
+    )
+
+
+def inbox_query(user_id: int, ser: RowSerializer, unread_only: bool = False):
+    """Column rows in `ser` order, newest first."""
+    through = read_through(user_id)
+    computed = {
+        "broadcast": N.user_id.is_(None),
+        "read": case((_unread(user_id, through), False), else_=True),
+        "read_at": func.coalesce(N.read_at, R.read_at),
+    }
+    cols = [computed[a].label(a) if a in computed else getattr(N, a) for a in ser.attributes]
+    qry = _base(user_id)
+    if unread_only:
+        qry = qry.filter(_unread(user_id, through))
+    return qry.with_entities(*cols).order_by(N.id.desc())
+
+
+def since(user_id: int, ser: RowSerializer, after_id: int, limit: int = 100) -> list:
+    """Visible rows with id > after_id, oldest first (SSE catch-up)."""
+    return (inbox_query(user_id, ser).filter(N.id > after_id)
+            .order_by(None).order_by(N.id.asc()).limit(limit).all())
+
+
+def latest_id() -> int:
+    return db.session.query(func.max(N.id)).scalar() or 0
+
+
+def unread_count(user_id: int) -> int:
+    def count():
+        through = read_through(user_id)
+        return _base(user_id).filter(_unread(user_id, through)).with_entities(func.count(N.id)).scalar()
+
+    return _unread_cache.get_or_set(user_id, (_user_version(user_id), NEW_NOTIFICATIONS), count)[0]
+
+
+def mark_read(user_id: int, notification_id: int) -> bool:
+    """False when the notification doesn't exist or isn't addressed to the user."""
+    n = (db.session.query(N.id, N.user_id, N.read_at)
+         .filter(N.id == notification_id, or_(N.user_id == user_id, N.user_id.is_(None)))
+         .first())
+    if n is None:
+        return False
+    if n.user_id is not None:
+        if n.read_at is None:
+            db.session.execute(update(N).where(N.id == n.id).values(read_at=datetime.utcnow()))
+    elif n.id > read_through(user_id) and db.session.get(R, (n.id, user_id)) is None:
+        db.session.add(R(notification_id=n.id, user_id=user_id))
+    try:
+        db.session.commit()
+    except IntegrityError:  # a concurrent mark-read of the same broadcast won
+        db.session.rollback()
+    bump_tables(_user_version(user_id))
+    return True
+
+
+def mark_all_read(user_id: int, up_to: int | None = None) -> int:
+    """
+    Everything visible with id <= up_to (default: the newest notification) becomes read.
+    Pass the newest id the client has seen so later arrivals stay unread. Returns the watermark.
+    """
+    if up_to is None:
+        up_to = latest_id()
+    db.session.execute(
+        update(N).where(N.user_id == user_id, N.read_at.is_(None), N.id <= up_to).values(read_at=datetime.utcnow())
+    )
+    inbox = db.session.get(NotificationInbox, user_id)
+    if inbox is None:
+        inbox = NotificationInbox(user_id=user_id, read_through=up_to)
+        db.session.add(inbox)
+    elif inbox.read_through < up_to:
+        inbox.read_through = up_to
+    db.session.flush()
+    # single marks under the watermark are redundant now
+    db.session.execute(delete(R).where(R.user_id == user_id, R.notification_id <= inbox.read_through))
+    db.session.commit()
+    bump_tables(_user_version(user_id))
+    return inbox.read_through
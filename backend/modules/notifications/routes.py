@@ -0,0 +1,102 @@
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from db_routing import use_primary
+from modules.core.pagination import parse_pagination_args, parse_cursor_arg, keyset_paginate, cursor_page_to_dict
+from modules.core.serializers import row_serializer
+from .schemas import NotificationOut
+from modules.core.models import Notification
+from modules.core.constants import SSE_MAX_SECONDS, SSE_HEARTBEAT_SECONDS
+from . import inbox
+from .stream import hub, iter_events, sse_event
+
+bp = Blueprint("notifications", __name__)
+
+
+def _uid() -> int:
+    return int(get_jwt_identity())
+
+
+@bp.route("/", methods=["GET"], strict_slashes=False)
+@jwt_required()
+def list_notifications():
+    """
+    Newest first, keyset-paginated.
+      cursor: empty/absent for the first page, then the returned next_cursor
+      size: page size
+      unread: 1 = unread only
+    """
+    _, size = parse_pagination_args()
+    cursor = parse_cursor_arg() or ""
+    unread_only = request.args.get("unread", "").lower() in ("1", "true", "yes")
+    uid = _uid()
+    ser = row_serializer(NotificationOut)
+    query = inbox.inbox_query(uid, ser, unread_only=unread_only)
+    try:
+        cp = keyset_paginate(query, [(Notification.id, True)], cursor, size, tag="unread" if unread_only else "all")
+    except ValueError:
+        return jsonify({"message": "Invalid cursor"}), 400
+    return jsonify({**cursor_page_to_dict(cp, ser.many(cp.items)), "unread": inbox.unread_count(uid)}), 200
+
+
+@bp.get("/unread-count")
+@jwt_required()
+def unread_count():
+    return jsonify({"unread": inbox.unread_count(_uid())}), 200
+
+
+@bp.post("/<int:nid>/read")
+@jwt_required()
+def mark_read(nid: int):
+    uid = _uid()
+    if not inbox.mark_read(uid, nid):
+        return jsonify({"message": "Not found"}), 404
+    return jsonify({"read": True, "unread": inbox.unread_count(uid)}), 200
+
+
+@bp.post("/read-all")
+@jwt_required()
+def mark_all_read():
+    """Body (optional): {"up_to": <newest id the client has seen>}."""
+    up_to = (request.get_json(silent=True) or {}).get("up_to")
+    if up_to is not None and not isinstance(up_to, int):
+        return jsonify({"message": "up_to must be an integer"}), 400
+    uid = _uid()
+    through = inbox.mark_all_read(uid, up_to)
+    return jsonify({"read_through": through, "unread": inbox.unread_count(uid)}), 200
+
+
+@bp.get("/stream")
+@jwt_required(locations=["headers", "query_string"])
+@use_primary()  # the backlog must not lag behind the listener, which reads the primary
+def stream():
+    """
+    Server-Sent Events: one `notification` event per new row for this user.
+    EventSource can't send headers, so the access token may come as ?jwt=.
+    Reconnects resume after Last-Event-ID (up to 100 missed rows; reload the inbox beyond that).
+    Serve it from the gevent `stream` process (Procfile), where a stream is a greenlet;
+    on a threaded worker each stream holds a thread. Either way capped per worker
+    (503 + Retry-After) and closed after SSE_MAX_SECONDS, which the browser turns into
+    a quiet reconnect.
+    """
+    uid = _uid()
+    sub = hub.subscribe(current_app._get_current_object(), uid)
+    if sub is None:
+        return jsonify({"message": "Too many live connections"}), 503, {"Retry-After": "30"}
+    try:
+        try:
+            last = int(request.headers.get("Last-Event-ID") or 0)
+        except ValueError:
+            last = 0
+        backlog = []
+        if last:
+            ser = row_serializer(NotificationOut)
+            dumps = current_app.json.dumps
+            backlog = [(r.id, sse_event(r.id, "notification", dumps(ser(r), separators=(",", ":"))))
+                       for r in inbox.since(uid, ser, last)]
+        start_id = last or inbox.latest_id()
+    except Exception:
+        hub.unsubscribe(sub)
+        raise
+    body = iter_events(sub, backlog, start_id, SSE_MAX_SECONDS, SSE_HEARTBEAT_SECONDS)
+    return Response(body, mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,14 @@
+from marshmallow import Schema, fields
+
+class NotificationOut(Schema):
+    id = fields.Int()
+    type = fields.Str()
+    severity = fields.Str()
+    title = fields.Str()
+    body = fields.Str(allow_none=True)
+    object_table = fields.Str(allow_none=True)
+    object_id = fields.Int(allow_none=True)
+    broadcast = fields.Bool()
+    read = fields.Bool()
+    read_at = fields.DateTime(allow_none=True)
+    created_at = fields.DateTime(allow_none=True)
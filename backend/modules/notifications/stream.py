@@ -0,0 +1,237 @@
+# modules/notifications/stream.py
+"""
+Live notifications for Server-Sent Events.
+
+One listener thread per worker watches the notifications table and fans new
+rows out to the open streams of that worker, so the database sees one cheap
+"id > last seen" query per change per worker, however many tabs are open.
+
+The listener wakes up on:
+  - Postgres: LISTEN on NOTIFY_CHANNEL (a statement-level trigger on
+    notifications does pg_notify, so every writer in every worker counts)
+  - elsewhere (SQLite/MySQL): commits of this worker that wrote to
+    notifications (modules.core.cache.on_commit), plus a poll every
+    SSE_POLL_SECONDS for other workers' writes
+
+The listener only runs while the worker has open streams: it exits (and
+gives its LISTEN connection back) within SSE_POLL_SECONDS of the last one
+closing, and the next subscribe starts it again.
+
+Under the `stream` process's gevent worker (gunicorn.conf.py) threads, locks
+and queues here are monkey-patched into greenlets, so an open stream costs a
+greenlet rather than a thread and the per-worker cap is SSE_WORKER_CONNECTIONS.
+
+Events are encoded once and handed to subscribers through bounded queues; a
+subscriber that falls behind is dropped and catches up on reconnect
+(Last-Event-ID).
+"""
+from __future__ import annotations
+
+import logging, queue, select, threading, time
+from typing import Iterator
+
+from flask import Flask
+from sqlalchemy.orm import Session
+from sqlalchemy import event, func
+
+from extensions import db
+from modules.core.cache import on_commit
+from modules.core.constants import SSE_MAX_CLIENTS, SSE_POLL_SECONDS, SSE_WORKER_CONNECTIONS
+from modules.core.models import Notification
+from modules.core.serializers import row_serializer
+from .schemas import NotificationOut
+
+log = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "notifications"
+QUEUE_SIZE = 256
+FETCH_LIMIT = 500
+
+_OVERFLOW = object()
+
+# the row fields every receiver shares; read state of a new row is always "unread"
+_ser = row_serializer(NotificationOut, ("id", "type", "severity", "title", "body",
+                                        "object_table", "object_id", "created_at"))
+
+
+def _green() -> bool:
+    """True under a gevent worker (threading monkey-patched)."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("threading")
+
+
+def max_clients() -> int:
+    return SSE_WORKER_CONNECTIONS if _green() else SSE_MAX_CLIENTS
+
+
+class Subscriber:
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.queue: queue.Queue = queue.Queue(QUEUE_SIZE)
+
+
+class Hub:
+    """Per-worker fan-out from one listener thread to many SSE streams."""
+
+    def __init__(self):
+        self._subs: set[Subscriber] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = threading.local()
+        self._thread: threading.Thread | None = None
+        self._app: Flask | None = None
+        self._last_id = 0
+
+    # ---- subscriptions ----
+    def subscribe(self, app: Flask, user_id: int) -> Subscriber | None:
+        """None when this worker already serves max_clients() streams."""
+        with self._lock:
+            if len(self._subs) >= max_clients():
+                return None
+            sub = Subscriber(user_id)
+            self._subs.add(sub)
+            if self._thread is None or not self._thread.is_alive():
+                self._start(app)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    def _publish(self, row_id: int, user_id: int | None, text: str) -> None:
+        with self._lock:
+            subs = list(self._subs)
+        for sub in subs:
+            if user_id is not None and sub.user_id != user_id:
+                continue
+            try:
+                sub.queue.put_nowait((row_id, text))
+            except queue.Full:
+                self._drop(sub)
+
+    def _drop(self, sub: Subscriber) -> None:
+        self.unsubscribe(sub)
+        while True:  # make room for the overflow marker
+            try:
+                sub.queue.get_nowait()
+            except queue.Empty:
+                break
+        sub.queue.put_nowait(_OVERFLOW)
+
+    # ---- local wake-ups (non-Postgres) ----
+    def _on_commit(self, tables: set[str]) -> None:
+        # Engine "commit" fires before the DBAPI commit; wake in Session.after_commit instead
+        if Notification.__tablename__ in tables:
+            self._pending.flag = True
+
+    def _after_commit(self, session) -> None:
+        if getattr(self._pending, "flag", False):
+            self._pending.flag = False
+            self._wake.set()
+
+    # ---- listener ----
+    def _start(self, app: Flask) -> None:
+        self._app = app
+        self._thread = threading.Thread(target=self._run, name="notifications-listener", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        with self._app.app_context():
+            self._last_id = db.session.query(func.max(Notification.id)).scalar() or 0
+            db.session.remove()
+            while True:
+                try:
+                    if db.engine.dialect.name == "postgresql":
+                        self._listen_pg()
+                    else:
+                        self._listen_local()
+                except Exception:
+                    log.exception("notifications listener failed; restarting")
+                    db.session.remove()
+                    time.sleep(SSE_POLL_SECONDS)
+                with self._lock:  # subscribe() starts a new listener once this one is gone
+                    if not self._subs:
+                        self._thread = None
+                        return
+
+    def _listen_local(self) -> None:
+        while self._subs:
+            self._wake.wait(SSE_POLL_SECONDS)
+            self._wake.clear()
+            self._fetch()
+
+    def _listen_pg(self) -> None:
+        raw = db.engine.raw_connection()
+        try:
+            conn = getattr(raw, "dbapi_connection", None) or raw.connection  # psycopg2 connection
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+            while self._subs:
+                if select.select([conn], [], [], SSE_POLL_SECONDS)[0]:
+                    conn.poll()
+                    conn.notifies.clear()
+                self._fetch()
+        finally:
+            raw.invalidate()  # don't hand a LISTENing connection back to the pool
+
+    def _fetch(self) -> None:
+        dumps = self._app.json.dumps
+        while True:
+            rows = (db.session.query(*_ser.columns(Notification, extra=[Notification.user_id]))
+                    .filter(Notification.id > self._last_id)
+                    .order_by(Notification.id)
+                    .limit(FETCH_LIMIT)
+                    .all())
+            db.session.remove()
+            for row in rows:
+                data = {**_ser(row), "broadcast": row.user_id is None, "read": False, "read_at": None}
+                self._publish(row.id, row.user_id, sse_event(row.id, "notification", dumps(data, separators=(",", ":"))))
+                self._last_id = row.id
+            if len(rows) < FETCH_LIMIT:
+                return
+
+
+def sse_event(event_id, name: str, data: str) -> str:
+    return f"id: {event_id}\nevent: {name}\ndata: {data}\n\n"
+
+
+def iter_events(sub: Subscriber, backlog: list[tuple[int, str]], start_id: int,
+                max_seconds: float, heartbeat: float) -> Iterator[str]:
+    """
+    SSE body: reconnect hint, backlog [(id, event)] (or just `id: start_id`, so
+    a reconnect resumes from there), then live events and heartbeats until
+    max_seconds. Subscribe before reading the backlog; live events it already
+    covered are skipped.
+    """
+    seen = start_id
+    try:
+        yield "retry: 3000\n\n"
+        for seen, text in backlog:
+            yield text
+        if not backlog and start_id:
+            yield f"id: {start_id}\n\n"
+        deadline = time.monotonic() + max_seconds
+        while True:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return
+            try:
+                item = sub.queue.get(timeout=min(heartbeat, left))
+            except queue.Empty:
+                yield ": ping\n\n"
+                continue
+            if item is _OVERFLOW:
+                return
+            row_id, text = item
+            if row_id > seen:
+                yield text
+    finally:
+        hub.unsubscribe(sub)
+
+
+hub = Hub()
+on_commit(hub._on_commit)
+event.listen(Session, "after_commit", hub._after_commit)
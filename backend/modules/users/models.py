@@ -4,6 +4,7 @@ from modules.core.model_mixins import QueryHelperMixin
 from extensions import db
 from sqlalchemy.orm import relationship, joinedload
 from modules.core.models import Branch, UserBranch
+from modules.core.search import register_search, text_search, search_rank
 from sqlalchemy import Index, func, event, or_
 
 class TimestampMixin:
@@ -73,6 +74,7 @@ class User(db.Model, QueryHelperMixin, TimestampMixin):
     # so we also create it explicitly in the migration.
     __table_args__ = (
         Index("uq_users_email_lower", func.lower(email), unique=True),
+        Index("ix_users_updated_at", "updated_at"),  # search index refresh polls by updated_at
     )
 
     def set_password(self, raw: str) -> None:
@@ -108,29 +110,32 @@ class User(db.Model, QueryHelperMixin, TimestampMixin):
         # Always load role when fetching users for API
         return [joinedload(cls.role)]
 
+    # substring-searched columns (pg_trgm GIN indexes on Postgres, see modules.core.search)
+    SEARCH_COLUMNS = ("email", "first_name", "last_name")
+
     @classmethod
-    def search(cls, q: str | None):
-        base = cls.base_query()
-        if not q:
+    def search(cls, q: str | None, eager: bool = True):
+        # eager=False for column-only queries (with_entities) that can't take loader options
+        base = cls.base_query() if eager else cls.query
+        if not q or not q.strip():
             return base
-        s = f"%{q.strip().lower()}%"
-        return base.filter(
-            or_(
-                func.lower(cls.email).like(s),
-                func.lower(cls.first_name).like(s),
-                func.lower(cls.last_name).like(s),
-            )
-        )
+        return base.filter(text_search(cls, cls.SEARCH_COLUMNS, q))
 
     @classmethod
-    def list_for_api(cls, q: str | None, order: str | None = None):
-        qry = cls.search(q)
-        # simple ordering; extend as needed
+    def sort_keys(cls, order: str | None) -> list:
+        """[(column, is_desc)] for ?order; id is the unique tie-breaker (keyset-safe)."""
         if order == "email_desc":
-            qry = qry.order_by(cls.email.desc())
-        else:
-            qry = qry.order_by(cls.email.asc())
-        return qry
+            return [(cls.email, True), (cls.id, True)]
+        return [(cls.email, False), (cls.id, False)]
+
+    @classmethod
+    def list_for_api(cls, q: str | None, order: str | None = None, eager: bool = True):
+        qry = cls.search(q, eager=eager)
+        if q and q.strip() and not order:
+            # no explicit order while searching: best matches first
+            qry = qry.order_by(search_rank(cls, cls.SEARCH_COLUMNS, ("email",), q).desc())
+        # simple ordering; extend as needed
+        return qry.order_by(*[c.desc() if d else c.asc() for c, d in cls.sort_keys(order)])
 
     def as_auth_payload(self) -> dict:
         """
@@ -154,6 +159,8 @@ class User(db.Model, QueryHelperMixin, TimestampMixin):
         }
         return {"user": user_dict, "modules": modules, "claims": claims}
 
+register_search(User, User.SEARCH_COLUMNS)
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Normalize emails to lowercase on write (prevents future mixed-case rows)
 # NOTE: these must live OUTSIDE the class body.
@@ -1,17 +1,43 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from modules.core.pagination import parse_pagination_args, paginate, page_to_dict
-from .models import User, Role
+from modules.core.pagination import (
+    parse_pagination_args, parse_cursor_arg, parse_total_mode, paginate, keyset_paginate, page_to_dict, cursor_page_to_dict,
+)
+from .models import User, Role, roles_permissions
 from .schemas import UserOut
+from modules.core.serializers import row_serializer, parse_fields_arg, is_row_serializable
 from extensions import db
 from ..auth.permissions import permission_required
 from common.utils import infer_modules_from_permissions
+from common.utils.conditional import conditional
+from modules.core.models import AppModule
+from sqlalchemy import select, func
 
 bp = Blueprint("users", __name__)
 
 
+def _me_validator():
+    """/me depends on the user row, its role, the role's grants and the module registry."""
+    uid = int(get_jwt_identity())
+    rp = roles_permissions.c
+    row = db.session.execute(
+        select(
+            User.updated_at, Role.updated_at,
+            select(func.max(AppModule.updated_at)).scalar_subquery(),
+            select(func.count(AppModule.id)).scalar_subquery(),
+            select(func.count()).select_from(roles_permissions).where(rp.role_id == User.role_id).scalar_subquery(),
+            select(func.coalesce(func.sum(rp.permission_id), 0)).where(rp.role_id == User.role_id).scalar_subquery(),
+        ).join(Role, Role.id == User.role_id).where(User.id == uid)
+    ).first()
+    if row is None:
+        return None
+    last_modified = max(d for d in row[:3] if d is not None)
+    return (last_modified, *row)
+
+
 @bp.get("/me")
 @jwt_required()
+@conditional(_me_validator)
 def me():
     uid = get_jwt_identity()
     user = User.query.get_or_404(int(uid))
@@ -25,12 +51,36 @@ def me():
 @jwt_required()
 @permission_required("api:users:read")
 def list_users():
+    """
+    fields: comma-separated UserOut fields (default: all). A subset of plain
+    columns (id, email, first_name, last_name, is_active) is served from column
+    rows; role/role_code/permissions still need the ORM objects.
+    """
     page, size = parse_pagination_args()
+    cursor = parse_cursor_arg()
     q = request.args.get("q")
     order = request.args.get("order")
-    query = User.list_for_api(q=q, order=order)
-    paged = paginate(query, page, size)
-    data = UserOut(many=True).dump(paged.items)
+    try:
+        only = parse_fields_arg(UserOut)
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+    keys = User.sort_keys(order)
+    rows = only is not None and is_row_serializable(UserOut, only)
+    query = User.list_for_api(q=q, order=order, eager=not rows)
+    if rows:
+        ser = row_serializer(UserOut, only)
+        query = query.with_entities(*ser.columns(User, extra=[c for c, _ in keys] if cursor is not None else ()))
+        dump = ser.many
+    else:
+        dump = UserOut(many=True, only=only).dump
+    if cursor is not None:
+        try:
+            cp = keyset_paginate(query, keys, cursor, size, tag=order or "email_asc")
+        except ValueError:
+            return jsonify({"message": "Invalid cursor"}), 400
+        return jsonify(cursor_page_to_dict(cp, dump(cp.items))), 200
+    paged = paginate(query, page, size, total_mode=parse_total_mode())
+    data = dump(paged.items)
     return jsonify(page_to_dict(paged, data)), 200
 
 
@@ -7,16 +7,14 @@ or:
   (.venv) python seeds\seed_employees_from_excel.py
 """
 from __future__ import annotations
-import argparse, os, math
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import argparse, os
+from typing import List, Dict, Any
 
 from app import app
 from extensions import db
-import sqlalchemy as sa
 
 from modules.core.models import Branch
-from modules.hr.models import Employee
+from modules.hr.importer import transform_row, bulk_insert_employees
 
 DEFAULT_XLSX_PATH = "sample_Labor List_2025.XLSX"
 
@@ -55,141 +53,6 @@ def _read_rows_xlsx(path: str) -> List[Dict[str, Any]]:
     else:
         raise RuntimeError("Please install either pandas or openpyxl to read Excel files.")
 
-# ---------- helpers ----------
-def _first_nonempty(d: Dict[str, Any], keys: List[str], default: str = "") -> str:
-    for k in keys:
-        v = d.get(k)
-        if v is None:
-            continue
-        s = str(v).strip()
-        if s:
-            return s
-    return default
-
-def _to_float(v: Any) -> float:
-    try:
-        if v is None or (isinstance(v, float) and (math.isnan(v) or math.isinf(v))):
-            return 0.0
-        return float(str(v).strip().replace(",", ""))
-    except Exception:
-        return 0.0
-
-def _to_date(v: Any):
-    # very tolerant date parser; pandas usually gives datetime already
-    try:
-        import pandas as pd  # type: ignore
-        if isinstance(v, (str, bytes)):
-            s = str(v).strip()
-            if not s:
-                return None
-            return pd.to_datetime(s, errors="coerce").date()
-        elif hasattr(v, "date"):
-            return v.date()
-        return None
-    except Exception:
-        return None
-
-# Build one employee dict from a raw Excel row
-def transform_row(r: Dict[str, Any], idx: int, branch_by_code: dict[str,int], branch_by_name: dict[str,int]) -> Dict[str, Any]:
-    code  = _first_nonempty(r, ["code", "emp_code", "employee code", "employee_code"], f"E{idx:04d}")
-    email = _first_nonempty(r, ["email", "mail"], f"emp{idx}@example.com").lower()
-
-    first = _first_nonempty(r, ["first_name", "first", "given name", "name_en", "name"], "")
-    last  = _first_nonempty(r, ["last_name", "last", "surname"], "")
-    if not first:
-        full = _first_nonempty(r, ["employee name", "employee_name"], "")
-        if full:
-            parts = full.split()
-            first = parts[0] if parts else f"Emp{idx}"
-            last  = " ".join(parts[1:]) if len(parts) > 1 else ""
-
-    phone = _first_nonempty(r, ["phone", "mobile", "contact", "phone no", "mobile no"], "")
-    position = _first_nonempty(r, ["position", "designation", "profession", "trade", "job title"], "")
-    nationality = _first_nonempty(r, ["nationality", "country"], "")
-    dob = _to_date(_first_nonempty(r, ["dob", "date of birth", "birth date"], ""))
-
-    # salary × 0.317
-    salary_raw = _to_float(_first_nonempty(r, ["salary", "monthly_salary", "basic", "base", "wage"], "0"))
-    salary_monthly = round(salary_raw * 0.317, 2)
-
-    # branch resolve
-    branch_str = _first_nonempty(r, ["branch", "site", "location", "office"], "")
-    branch_id: Optional[int] = None
-    if branch_str:
-        key = branch_str.strip().lower()
-        branch_id = branch_by_code.get(key) or branch_by_name.get(key)
-
-    # Collect everything else into meta (raw snapshot)
-    known_keys = {
-        "code","emp_code","employee code","employee_code",
-        "email","mail",
-        "first_name","first","given name","name_en","name","employee name","employee_name",
-        "last_name","last","surname",
-        "phone","mobile","contact","phone no","mobile no",
-        "position","designation","profession","trade","job title",
-        "nationality","country",
-        "dob","date of birth","birth date",
-        "salary","monthly_salary","basic","base","wage",
-        "branch","site","location", "office",
-    }
-    meta = {k: v for k, v in r.items() if k not in known_keys}
-
-    out = dict(
-        code=code,
-        first_name=first or f"Emp{idx}",
-        last_name=last or "",
-        email=email,
-        phone=phone or None,
-        position=position or None,
-        branch_id=branch_id,
-        hire_date=None,              # we will fill when/if we know which header carries it
-        termination_date=None,
-        is_active=True,
-        salary_monthly=salary_monthly,
-        nationality=nationality or None,
-        dob=dob,
-        meta=meta or None,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
-    )
-    return out
-
-# constrain to real table columns (safe across DBs)
-def _filter_to_table_columns(row: Dict[str, Any], table: sa.Table) -> Dict[str, Any]:
-    cols = {c.name for c in table.c}
-    return {k: v for k, v in row.items() if k in cols}
-
-def bulk_insert_employees(rows: List[Dict[str, Any]]) -> int:
-    if not rows:
-        return 0
-    table = sa.inspect(Employee).local_table
-    filtered = [_filter_to_table_columns(r, table) for r in rows]
-    filtered = [r for r in filtered if r.get("code") or r.get("email")]
-    if not filtered:
-        return 0
-
-    dialect = db.engine.dialect.name
-    conflict_col = "code" if "code" in table.c else ("email" if "email" in table.c else None)
-
-    if dialect == "postgresql":
-        from sqlalchemy.dialects.postgresql import insert as psql_insert
-        stmt = psql_insert(table).values(filtered)
-        if conflict_col:
-            stmt = stmt.on_conflict_do_nothing(index_elements=[table.c[conflict_col]])
-        else:
-            stmt = stmt.on_conflict_do_nothing()
-        res = db.session.execute(stmt)
-        return res.rowcount or 0
-    elif dialect in {"mysql", "mariadb"}:
-        from sqlalchemy.dialects.mysql import insert as mysql_insert
-        stmt = mysql_insert(table).values(filtered).prefix_with("IGNORE")
-        res = db.session.execute(stmt)
-        return res.rowcount or 0
-    else:
-        stmt = sa.insert(table).values(filtered).prefix_with("OR IGNORE")
-        res = db.session.execute(stmt)
-        return res.rowcount or 0
-
 def main(xlsx_path: str) -> None:
     # Preload branches for quick lookup
     branches = Branch.query.all()
@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+from db_pool import InstrumentedQueuePool
+
 BASE_DIR = Path(__file__).resolve().parent
 INSTANCE_DIR = BASE_DIR / 'instance'
 INSTANCE_DIR.mkdir(exist_ok=True)
@@ -33,8 +35,49 @@ def build_database_uri() -> str:
     else:
         raise RuntimeError(f"Unsupported DB_ENGINE: {engine}")
 
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+def engine_options(uri: str, env: str | None = None) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for the URI's dialect. Defaults per environment,
+    each overridable by env var:
+      DB_POOL_SIZE, DB_MAX_OVERFLOW   per worker: a gunicorn worker serves up to
+                                      --threads requests at once (16 in the Procfile)
+      DB_POOL_TIMEOUT                 seconds to wait for a free connection
+      DB_POOL_RECYCLE                 seconds before a connection is replaced
+      DB_POOL_PRE_PING                1/0: test connections on checkout
+      DB_STATEMENT_TIMEOUT_MS         server-side cap per statement (0 = off)
+      SQLITE_BUSY_TIMEOUT             seconds SQLite waits on a locked database
+    """
+    prod = not (env or os.getenv("APP_ENV") or "dev").lower().startswith("dev")
+    if uri.startswith("sqlite"):
+        # pooling is SQLAlchemy's per-file default; only the lock wait is tunable
+        return {"connect_args": {"timeout": _env_int("SQLITE_BUSY_TIMEOUT", 15)}}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": _env_int("DB_POOL_SIZE", 10 if prod else 5),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 10 if prod else 5),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 10 if prod else 30),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": bool(_env_int("DB_POOL_PRE_PING", 1)),
+    }
+    # migrations/env.py turns it off again for `flask db upgrade`
+    timeout_ms = _env_int("DB_STATEMENT_TIMEOUT_MS", 30_000 if prod else 0)
+    if timeout_ms and uri.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    elif timeout_ms and uri.startswith(("mysql", "mariadb")):
+        # SELECTs only; MySQL has no general statement timeout
+        options["connect_args"] = {"init_command": f"SET SESSION max_execution_time={timeout_ms}"}
+    return options
+
 class BaseConfig:
     SQLALCHEMY_DATABASE_URI = build_database_uri()
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_REPLICA_URIS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    DB_READ_YOUR_WRITES_SECONDS = int(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-change-me")
     JWT_TOKEN_LOCATION = ["headers"]
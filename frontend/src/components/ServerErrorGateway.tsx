@@ -9,6 +9,13 @@ import api from '../api'
 import { useAuth } from '../store/auth'
 import { ServerErrorBus, type ServerErrorPayload } from '../utils/serverErrorBus'
 
+// why the server dropped a report (modules/admin/ingest.py)
+const DROP_REASONS: Record<string, string> = {
+  rate_limited_client: 'You have sent many reports recently, so this one was not recorded. Please try again later.',
+  rate_limited_url: 'This problem has already been reported several times and is being looked at.',
+  queue_full: 'The server is busy and could not record this report. Please try again later.'
+}
+
 export default function ServerErrorGateway() {
   const { user } = useAuth()
 
@@ -16,14 +23,15 @@ export default function ServerErrorGateway() {
   const [err, setErr] = React.useState<ServerErrorPayload | null>(null)
   const [note, setNote] = React.useState('')
   const [submitting, setSubmitting] = React.useState(false)
-  const [submittedId, setSubmittedId] = React.useState<number | null>(null)
+  // POST /admin/issues answers 202 {queued, reason}: reports are written in batches, so there is no id yet
+  const [result, setResult] = React.useState<{ queued: boolean; reason: string | null } | null>(null)
 
   // Listen for any 500s emitted by the axios interceptor
   React.useEffect(() => {
     const unsub = ServerErrorBus.subscribe((payload) => {
       setErr(payload)
       setNote('')
-      setSubmittedId(null)
+      setResult(null)
       setOpen(true)
     })
     return unsub // proper cleanup
@@ -59,7 +67,7 @@ export default function ServerErrorGateway() {
       }
 
       const { data } = await api.post('/admin/issues', body)
-      setSubmittedId(data?.id ?? 0)
+      setResult({ queued: !!data?.queued, reason: data?.reason ?? null })
     } catch {
       // keep the dialog open; you could show an inline error if desired
     } finally {
@@ -87,14 +95,13 @@ export default function ServerErrorGateway() {
             <Chip size="small" color="primary" label={url} />
           </Stack>
 
-          {submittedId ? (
+          {result?.queued ? (
             <Alert icon={<CheckCircleOutlineIcon />} severity="success" variant="outlined">
               Issue reported successfully. We’ll investigate and fix it ASAP.
-              {!!submittedId && (
-                <Typography component="span" sx={{ ml: 1 }} color="text.secondary">
-                  Ref #{submittedId}
-                </Typography>
-              )}
+            </Alert>
+          ) : result ? (
+            <Alert severity="warning" variant="outlined">
+              {DROP_REASONS[result.reason ?? ''] ?? 'The report could not be accepted right now.'}
             </Alert>
           ) : (
             <>
@@ -118,7 +125,7 @@ export default function ServerErrorGateway() {
           Close
         </Button>
 
-        {!submittedId && (
+        {!result && (
           <Button
             onClick={handleReport}
             variant="contained"